@@ -1,38 +1,63 @@
-from channels.generic.websocket import AsyncJsonWebsocketConsumer
+import asyncio
+import contextlib
 
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+PROGRESS_FLUSH_INTERVAL_SECONDS = 0.1
+
+
+class _CoalescingProgressConsumer(AsyncWebsocketConsumer):
+    """Relay progress frames, sending only the latest one per flush interval."""
+
+    group_prefix = ""
+    url_kwarg = ""
 
-class UploadProgressConsumer(AsyncJsonWebsocketConsumer):
     async def connect(self):
-        self.task_id = self.scope["url_route"]["kwargs"]["task_id"]
-        self.group_name = f"upload_{self.task_id}"
+        self.group_name = f"{self.group_prefix}_{self.scope['url_route']['kwargs'][self.url_kwarg]}"
+        self._pending = asyncio.Queue(maxsize=1)
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
+        self._flush_task = asyncio.create_task(self._flush_loop())
 
     async def disconnect(self, close_code):
+        flush_task = getattr(self, "_flush_task", None)
+        if flush_task is not None:
+            flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await flush_task
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
 
-    async def receive_json(self, content, **kwargs):
-        # This consumer only sends server -> client updates.
+    async def receive(self, text_data=None, bytes_data=None):
+        # Progress consumers only send server -> client updates.
         pass
 
-    async def upload_progress(self, event):
-        await self.send_json(event.get("payload", {}))
+    def _enqueue(self, frame: bytes) -> None:
+        # Replace any frame still waiting to be flushed; only the newest state matters.
+        if self._pending.full():
+            self._pending.get_nowait()
+        self._pending.put_nowait(frame)
 
+    async def _flush_loop(self):
+        while True:
+            frame = await self._pending.get()
+            await asyncio.sleep(PROGRESS_FLUSH_INTERVAL_SECONDS)
+            if not self._pending.empty():
+                frame = self._pending.get_nowait()
+            await self.send(bytes_data=frame)
 
-class DeletionProgressConsumer(AsyncJsonWebsocketConsumer):
-    async def connect(self):
-        self.job_id = self.scope["url_route"]["kwargs"]["job_id"]
-        self.group_name = f"delete_{self.job_id}"
-        await self.channel_layer.group_add(self.group_name, self.channel_name)
-        await self.accept()
 
-    async def disconnect(self, close_code):
-        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+class UploadProgressConsumer(_CoalescingProgressConsumer):
+    group_prefix = "upload"
+    url_kwarg = "task_id"
 
-    async def receive_json(self, content, **kwargs):
-        # Deletion progress updates are server -> client only.
-        pass
+    async def upload_progress(self, event):
+        # Frames arrive pre-encoded from the publisher; relay them as-is.
+        self._enqueue(event.get("bytes", b"{}"))
 
-    async def deletion_progress(self, event):
-        await self.send_json(event.get("payload", {}))
 
+class DeletionProgressConsumer(_CoalescingProgressConsumer):
+    group_prefix = "delete"
+    url_kwarg = "job_id"
+
+    async def deletion_progress(self, event):
+        self._enqueue(event.get("bytes", b"{}"))
@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0004_deletionjob"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="uploadjob",
+            index=models.Index(fields=["status", "-created_at"], name="uploadjob_status_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="uploadjob",
+            index=models.Index(
+                condition=models.Q(("status", "in_progress")),
+                fields=["-created_at"],
+                name="uploadjob_inprogress_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="deletionjob",
+            index=models.Index(fields=["status", "-created_at"], name="deletionjob_status_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="deletionjob",
+            index=models.Index(
+                condition=models.Q(("status", "in_progress")),
+                fields=["-created_at"],
+                name="deletionjob_inprogress_idx",
+            ),
+        ),
+    ]
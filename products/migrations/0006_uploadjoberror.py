@@ -0,0 +1,57 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def explode_errors_json(apps, schema_editor):
+    UploadJob = apps.get_model("products", "UploadJob")
+    UploadJobError = apps.get_model("products", "UploadJobError")
+
+    pending = []
+    for job in UploadJob.objects.exclude(errors_json=[]).only("id", "errors_json").iterator():
+        for entry in job.errors_json or []:
+            if not isinstance(entry, dict):
+                continue
+            pending.append(
+                UploadJobError(
+                    job_id=job.id,
+                    row_index=entry.get("row"),
+                    message=entry.get("error") or entry.get("message") or "",
+                )
+            )
+        if len(pending) >= 500:
+            UploadJobError.objects.bulk_create(pending, batch_size=500)
+            pending = []
+    if pending:
+        UploadJobError.objects.bulk_create(pending, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0005_job_status_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UploadJobError",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("row_index", models.IntegerField(blank=True, null=True)),
+                ("message", models.TextField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="row_errors",
+                        to="products.uploadjob",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["row_index"],
+                "indexes": [models.Index(fields=["job", "row_index"], name="uploadjoberror_job_row_idx")],
+            },
+        ),
+        migrations.RunPython(explode_errors_json, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+from django.db.models.functions import Length
+
+
+def check_task_id_lengths(apps, schema_editor):
+    UploadJob = apps.get_model("products", "UploadJob")
+    too_long = (
+        UploadJob.objects.annotate(task_id_length=Length("task_id"))
+        .filter(task_id_length__gt=32)
+        .values_list("task_id", flat=True)[:5]
+    )
+    if too_long:
+        raise RuntimeError(
+            "Cannot shrink UploadJob.task_id to 32 characters; found longer values: "
+            + ", ".join(too_long)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0006_uploadjoberror"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_task_id_lengths, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="uploadjob",
+            name="task_id",
+            field=models.CharField(max_length=32, unique=True),
+        ),
+    ]
@@ -0,0 +1,32 @@
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0007_uploadjob_task_id_length"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="sku_lower",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.text.Lower("sku"),
+                output_field=models.CharField(max_length=255),
+            ),
+        ),
+        migrations.RunSQL(
+            sql="DROP INDEX IF EXISTS product_lower_sku_unique;",
+            reverse_sql=(
+                "CREATE UNIQUE INDEX IF NOT EXISTS product_lower_sku_unique "
+                "ON products_product (LOWER(sku));"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="product",
+            constraint=models.UniqueConstraint(fields=["sku_lower"], name="product_sku_lower_unique"),
+        ),
+    ]
@@ -1,11 +1,17 @@
-import uuid
+import secrets
 
 from django.conf import settings
 from django.db import models
+from django.db.models.functions import Lower
 
 
 class Product(models.Model):
     sku = models.CharField(max_length=255)
+    sku_lower = models.GeneratedField(
+        expression=Lower("sku"),
+        output_field=models.CharField(max_length=255),
+        db_persist=True,
+    )
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     price = models.DecimalField(max_digits=10, decimal_places=2)
@@ -15,8 +21,10 @@ class Product(models.Model):
 
     class Meta:
         indexes = [
-            models.Index(fields=["sku"]),
-            models.Index(fields=["created_at"]),
+            models.Index(fields=["created_at"], name="products_pr_create_66fda3_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["sku_lower"], name="product_sku_lower_unique"),
         ]
         ordering = ["-created_at"]
 
@@ -31,7 +39,7 @@ class UploadJob(models.Model):
         COMPLETED = "completed", "Completed"
         FAILED = "failed", "Failed"
 
-    task_id = models.CharField(max_length=64, unique=True)
+    task_id = models.CharField(max_length=32, unique=True)
     filename = models.CharField(max_length=255)
     status = models.CharField(
         max_length=32, choices=Status.choices, default=Status.PENDING
@@ -41,8 +49,19 @@ class UploadJob(models.Model):
     total_rows = models.IntegerField(null=True, blank=True)
     processed_rows = models.IntegerField(default=0)
     errors_json = models.JSONField(blank=True, default=list)
+    errors_truncated = models.IntegerField(default=0)
+    # Replace the whole catalogue: products are truncated before the rows are loaded.
+    truncate_before = models.BooleanField(default=False)
 
     class Meta:
+        indexes = [
+            models.Index(fields=["status", "-created_at"], name="uploadjob_status_created_idx"),
+            models.Index(
+                fields=["-created_at"],
+                name="uploadjob_inprogress_idx",
+                condition=models.Q(status="in_progress"),
+            ),
+        ]
         ordering = ["-created_at"]
 
     def __str__(self) -> str:
@@ -50,7 +69,25 @@ class UploadJob(models.Model):
 
     @staticmethod
     def generate_task_id() -> str:
-        return uuid.uuid4().hex
+        return secrets.token_hex(16)
+
+
+class UploadJobError(models.Model):
+    job = models.ForeignKey(
+        UploadJob, related_name="row_errors", on_delete=models.CASCADE
+    )
+    row_index = models.IntegerField(null=True, blank=True)
+    message = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["job", "row_index"], name="uploadjoberror_job_row_idx"),
+        ]
+        ordering = ["row_index"]
+
+    def __str__(self) -> str:
+        return f"UploadJobError #{self.pk} (row {self.row_index})"
 
 
 class DeletionJob(models.Model):
@@ -78,6 +115,14 @@ class DeletionJob(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
+        indexes = [
+            models.Index(fields=["status", "-created_at"], name="deletionjob_status_created_idx"),
+            models.Index(
+                fields=["-created_at"],
+                name="deletionjob_inprogress_idx",
+                condition=models.Q(status="in_progress"),
+            ),
+        ]
         ordering = ["-created_at"]
 
     def __str__(self) -> str:
@@ -0,0 +1,38 @@
+from typing import Dict, List, Optional
+
+
+def calculate_percent(processed: int, total: int) -> int:
+    if total <= 0:
+        return 100 if processed > 0 else 0
+    return min(100, int((processed / total) * 100))
+
+
+def job_progress(
+    status: str,
+    processed: Optional[int],
+    total: Optional[int],
+    errors: Optional[List],
+    errors_truncated: int = 0,
+) -> Dict:
+    """Progress payload served by the upload and deletion polling endpoints.
+
+    ``errors_truncated`` counts errors left out of ``errors`` once the job's
+    error cap was reached, so the reported count matches the WebSocket one.
+    """
+    processed = processed or 0
+    total = total or 0
+    errors = errors or []
+    error_message: Optional[str] = None
+    if errors:
+        first_error = errors[0]
+        if isinstance(first_error, dict):
+            error_message = first_error.get("error") or first_error.get("message")
+
+    return {
+        "status": status,
+        "processed": processed,
+        "total": total,
+        "percent": calculate_percent(processed, total),
+        "errors": len(errors) + (errors_truncated or 0),
+        "error": error_message,
+    }
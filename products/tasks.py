@@ -1,32 +1,126 @@
-import csv
 import logging
+import multiprocessing
+import re
+import statistics
+import time
 import traceback
-from decimal import Decimal, InvalidOperation
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from functools import lru_cache, partial
+from itertools import compress, repeat
+from operator import and_, is_not, itemgetter, not_
 from pathlib import Path
-from tempfile import NamedTemporaryFile
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
+import orjson
 from asgiref.sync import async_to_sync
-from celery import shared_task
+from celery import chord, group, shared_task
 from channels.layers import get_channel_layer
 from django.conf import settings
 from django.db import connection, transaction
 from django.utils import timezone
-from psycopg2 import sql
+from psycopg2 import IntegrityError
+from psycopg2.extras import execute_values
 
 from webhooks.models import Webhook
 from webhooks.tasks import queue_event
 
-from .models import DeletionJob, Product, UploadJob
+from .models import DeletionJob, Product, UploadJob, UploadJobError
+from .progress import calculate_percent
 from .utils.csv_batch_loader import CSVBatchLoader
+from .utils.pg_binary_copy import (
+    BinaryCopyEncoder,
+    encode_bool,
+    encode_numeric_cents,
+    encode_text,
+    encode_timestamptz,
+)
+from .utils.prefetch import prefetch
+
 logger = logging.getLogger(__name__)
 
 _channel_layer = None
+_normalize_pool: Optional[ProcessPoolExecutor] = None
 
 ProgressPayload = Dict[str, Optional[object]]
 
+# Last frame published per progress group, so repeated identical updates
+# (e.g. a delete batch that removed nothing new) skip the broker round trip.
+# Bounded as an LRU: web processes publish "pending" frames for jobs whose
+# terminal frame is sent by a worker, so their entries are never popped here.
+_last_progress_frames: "OrderedDict[str, bytes]" = OrderedDict()
+PROGRESS_FRAME_CACHE_SIZE = 256
+_TERMINAL_PROGRESS_STATUSES = frozenset({"completed", "failed"})
+
 TRUTHY_VALUES = {"1", "true", "yes", "y", "t"}
-MAX_ERROR_RECORDS = 50
+
+# Plain decimals with at most two places: "5", "+5", "-5.25", "5." and ".5"
+# all parse, exponents and a third decimal place don't.
+PRICE_PATTERN = re.compile(r"^[+-]?(\d+(\.\d{0,2})?|\.\d{1,2})$")
+
+# CSV columns read by the importer, in _normalize_batch unpacking order, with the
+# value used when the header omits the column.
+IMPORT_COLUMNS = {
+    "sku": "",
+    "name": "",
+    "description": "",
+    "price": "0",
+    "active": "true",
+}
+
+# Bytes psycopg2 pulls from the encoder per COPY data message.
+COPY_STREAM_READ_SIZE = 1 << 16
+
+# Rows sampled from the first batch to estimate the encoded COPY row width.
+COPY_SIZE_SAMPLE_ROWS = 500
+# Lower bound for adaptive COPY batches, however wide the rows are.
+MIN_COPY_BATCH_ROWS = 1000
+
+# Imports with fewer data rows than this bypass the staging table.
+SMALL_IMPORT_THRESHOLD = 200
+# Temporary tables are private to their session, so every import can share one
+# staging table name and the statements built from it.
+STAGING_TABLE_NAME = "tmp_products_upload"
+# Session-level advisory lock held while an import has products_product's
+# secondary indexes dropped.
+INDEX_REBUILD_LOCK_KEY = 0x70726F64
+
+# Normalized batches kept ready ahead of the COPY/progress loop.
+NORMALIZE_PREFETCH_DEPTH = 2
+
+# Minimum time between job/progress writes while an import is running.
+PROGRESS_UPDATE_INTERVAL_SECONDS = 0.5
+# Report progress at least this often even when the percentage hasn't moved.
+PROGRESS_HEARTBEAT_SECONDS = 1.0
+# Progress reports go out over Channels every time; the UploadJob row and the
+# Celery result (both database writes, read only by polling clients) are
+# checkpointed on every Nth report.
+PROGRESS_DB_CHECKPOINT_EVERY = 4
+
+# Every row of an import shares one timestamp, so encode each distinct
+# value once rather than once per row and column.
+_encode_batch_timestamp = lru_cache(maxsize=8)(encode_timestamptz)
+
+# Product columns loaded through the staging table, in COPY column order.
+_STAGING_COLUMNS = ("sku", "name", "description", "price", "active", "created_at", "updated_at")
+
+# A normalized row, in _STAGING_COLUMNS order; the price is in integer cents.
+NormalizedRow = Tuple[str, str, str, int, bool, datetime, datetime]
+
+# Column encoders for the staging table, in COPY column order.
+_STAGING_COPY_ENCODER = BinaryCopyEncoder(
+    [
+        encode_text,  # sku
+        encode_text,  # name
+        encode_text,  # description
+        encode_numeric_cents,  # price
+        encode_bool,  # active
+        _encode_batch_timestamp,  # created_at
+        _encode_batch_timestamp,  # updated_at
+    ]
+)
 
 
 def _get_channel_layer():
@@ -36,24 +130,31 @@ def _get_channel_layer():
     return _channel_layer
 
 
-def _calculate_percent(processed: int, total: int) -> int:
-    if total <= 0:
-        return 100 if processed > 0 else 0
-    return min(100, int((processed / total) * 100))
-
-
 def _publish_progress(
     identifier: str,
     namespace: str,
     event_type: str,
     payload: ProgressPayload,
 ) -> ProgressPayload:
+    group_name = f"{namespace}_{identifier}"
+    # Encode the WebSocket frame once here instead of in every subscribed
+    # consumer; the layer itself ships messages as msgpack.
+    frame = orjson.dumps(payload)
+    if payload.get("status") in _TERMINAL_PROGRESS_STATUSES:
+        _last_progress_frames.pop(group_name, None)
+    elif _last_progress_frames.get(group_name) == frame:
+        return payload
+    else:
+        _last_progress_frames.pop(group_name, None)
+        _last_progress_frames[group_name] = frame
+        while len(_last_progress_frames) > PROGRESS_FRAME_CACHE_SIZE:
+            _last_progress_frames.popitem(last=False)
     try:
         channel_layer = _get_channel_layer()
         if channel_layer is not None:
             async_to_sync(channel_layer.group_send)(
-                f"{namespace}_{identifier}",
-                {"type": event_type, "payload": payload},
+                group_name,
+                {"type": event_type, "bytes": frame},
             )
     except Exception:
         logger.exception("Failed to publish progress via Channels for %s %s", namespace, identifier)
@@ -102,143 +203,511 @@ def publish_delete_progress(
     return _publish_progress(str(job_id), "delete", "deletion.progress", payload)
 
 
-def _normalize_row(
-    row_number: int, row: Dict[str, Optional[str]]
-) -> Tuple[Optional[Dict[str, object]], Optional[Dict[str, object]]]:
-    normalized = {k.lower(): (v or "").strip() for k, v in row.items() if k}
+def estimate_product_count() -> int:
+    """Row count of products_product from the planner statistics.
 
-    raw_sku = normalized.get("sku", "")
-    if not raw_sku:
-        return None, {"row": row_number, "error": "SKU is required."}
-    sku = raw_sku
-    sku_lower = sku.lower()
+    Reading ``pg_class.reltuples`` is a catalog lookup instead of a full
+    scan. Tables that have never been analyzed (or other databases) fall back
+    to an exact COUNT(*).
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass;",
+                [Product._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row and row[0] > 0:
+            return row[0]
+    return Product.objects.count()
 
-    name = normalized.get("name", "")
-    description = normalized.get("description", "")
 
-    raw_price = normalized.get("price", "0")
-    try:
-        price = Decimal(raw_price or "0")
-    except InvalidOperation:
-        return None, {
-            "row": row_number,
-            "error": f"Invalid price value '{raw_price}'.",
-        }
+def _parse_price_cents(raw_price: str) -> Optional[int]:
+    """Parse a plain decimal price with at most two places into integer cents."""
+    if not raw_price:
+        return 0
+    if PRICE_PATTERN.match(raw_price) is None:
+        return None
+    whole, _, frac = raw_price.lstrip("+-").partition(".")
+    cents = int(whole or "0") * 100 + int(frac.ljust(2, "0"))
+    return -cents if raw_price.startswith("-") else cents
 
-    raw_active = normalized.get("active", "true").lower()
-    active = raw_active in TRUTHY_VALUES
 
-    now_iso = timezone.now().isoformat()
+def _normalize_batch(
+    batch: List[Tuple[int, Tuple[str, ...]]], now: datetime
+) -> Tuple[int, List[NormalizedRow], List[Dict[str, object]]]:
+    """Normalize one loader batch into (row count, valid rows, row errors)."""
+    if not batch:
+        return 0, [], []
 
-    return (
-        {
-            "sku": sku,
-            "sku_lower": sku_lower,
-            "name": name,
-            "description": description,
-            "price": price,
-            "active": active,
-            "created_at": now_iso,
-            "updated_at": now_iso,
-        },
-        None,
+    # Work a column at a time with map()/compress() over C-level callables;
+    # Python only runs per row for price parsing and for rows with errors.
+    skus, names, descriptions, raw_prices, raw_actives = zip(*map(itemgetter(1), batch))
+    skus = list(map(str.strip, skus))
+    raw_prices = list(map(str.strip, raw_prices))
+    prices = list(map(_parse_price_cents, raw_prices))
+    valid = list(map(and_, map(bool, skus), map(partial(is_not, None), prices)))
+
+    errors: List[Dict[str, object]] = []
+    if not all(valid):
+        invalid_rows = compress(zip(map(itemgetter(0), batch), skus, raw_prices), map(not_, valid))
+        for row_number, sku, raw_price in invalid_rows:
+            if not sku:
+                errors.append({"row": row_number, "error": "SKU is required."})
+            else:
+                errors.append({"row": row_number, "error": f"Invalid price value '{raw_price}'."})
+
+    columns = zip(
+        compress(skus, valid),
+        map(str.strip, compress(names, valid)),
+        map(str.strip, compress(descriptions, valid)),
+        compress(prices, valid),
+        map(TRUTHY_VALUES.__contains__, map(str.lower, map(str.strip, compress(raw_actives, valid)))),
+        repeat(now),
+        repeat(now),
+    )
+    normalized_rows = list(columns)
+    return len(batch), normalized_rows, errors
+
+
+_PRODUCT_UPSERT_CONFLICT_SQL = """ON CONFLICT (sku_lower)
+            DO UPDATE SET
+                name = EXCLUDED.name,
+                description = EXCLUDED.description,
+                price = EXCLUDED.price,
+                active = EXCLUDED.active,
+                updated_at = EXCLUDED.updated_at"""
+
+# Used instead of the staging table for imports too small to amortize its DDL
+# and COPY round trips. Prices arrive as integer cents.
+_DIRECT_UPSERT_SQL = f"""
+            INSERT INTO products_product (sku, name, description, price, active, created_at, updated_at)
+            VALUES %s
+            {_PRODUCT_UPSERT_CONFLICT_SQL};
+        """
+_DIRECT_UPSERT_TEMPLATE = "(%s, %s, %s, %s::numeric / 100, %s, %s, %s)"
+
+# Shared by bulk deletes and truncate_before uploads.
+_TRUNCATE_PRODUCTS_SQL = f"TRUNCATE TABLE {Product._meta.db_table} RESTART IDENTITY CASCADE;"
+
+# Loads rows straight into products_product when no SKU can collide: the table
+# was empty (or truncated) at the start and the file has had no repeats so far.
+_PRODUCT_COPY_SQL = f"""
+            COPY products_product ({", ".join(_STAGING_COLUMNS)})
+            FROM STDIN WITH (FORMAT BINARY);
+        """
+
+
+class _StagingSQL(NamedTuple):
+    """SQL for one import's staging table, built once per task."""
+
+    table: str
+    create: str
+    truncate: str
+    copy: str
+    upsert: str
+    drop: str
+
+
+@lru_cache(maxsize=None)
+def _staging_column_definitions() -> str:
+    """Column DDL for the staging table, typed from the Product model.
+
+    ``CREATE TABLE ... (LIKE products_product)`` would also copy the id and
+    generated sku_lower columns and their NOT NULL constraints, which COPY
+    doesn't fill, so only the staged columns are mirrored.
+    """
+    return ",\n                ".join(
+        f"{connection.ops.quote_name(name)} {Product._meta.get_field(name).db_type(connection)}"
+        for name in _STAGING_COLUMNS
     )
 
 
+@lru_cache(maxsize=None)
+def _build_staging_sql(temp_table_name: str) -> _StagingSQL:
+    quoted_temp_table = connection.ops.quote_name(temp_table_name)
+    return _StagingSQL(
+        table=temp_table_name,
+        # Temporary tables are never WAL-logged and live in backend-local
+        # buffers, so they already ingest COPY as cheaply as an UNLOGGED table
+        # without adding a shared catalog entry per import.
+        create=f"""
+            CREATE TEMP TABLE IF NOT EXISTS {quoted_temp_table} (
+                {_staging_column_definitions()}
+            ) ON COMMIT PRESERVE ROWS;
+        """,
+        # Clears rows left by an earlier import that reused this name on the
+        # same pooled connection.
+        truncate=f"TRUNCATE {quoted_temp_table};",
+        copy=f"""
+            COPY {quoted_temp_table} (sku, name, description, price, active, created_at, updated_at)
+            FROM STDIN WITH (FORMAT BINARY);
+        """,
+        upsert=f"""
+            INSERT INTO products_product (sku, name, description, price, active, created_at, updated_at)
+            SELECT DISTINCT ON (LOWER(sku))
+                sku,
+                name,
+                description,
+                price,
+                active,
+                created_at,
+                updated_at
+            FROM {quoted_temp_table}
+            ORDER BY LOWER(sku), ctid DESC
+            {_PRODUCT_UPSERT_CONFLICT_SQL};
+        """,
+        drop=f"DROP TABLE IF EXISTS {quoted_temp_table};",
+    )
+
+
+def _drop_secondary_indexes() -> List[str]:
+    """Drop products_product's non-unique indexes and return their definitions.
+
+    The unique sku_lower index backs ON CONFLICT and the primary key is
+    needed by everything else, so both stay. The drops are CONCURRENTLY so
+    readers of products_product aren't locked out while the import runs.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT index_class.relname, pg_get_indexdef(index_class.oid)
+            FROM pg_index
+            JOIN pg_class AS index_class ON index_class.oid = pg_index.indexrelid
+            WHERE pg_index.indrelid = %s::regclass
+              AND NOT pg_index.indisunique
+              AND NOT pg_index.indisprimary;
+            """,
+            [Product._meta.db_table],
+        )
+        indexes = cursor.fetchall()
+        for name, _ in indexes:
+            cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {connection.ops.quote_name(name)};")
+    return [definition for _, definition in indexes]
+
+
+def _restore_indexes(definitions: List[str]) -> List[str]:
+    """Rebuild indexes dropped by _drop_secondary_indexes without blocking writes.
+
+    Returns the definitions that failed to build; _ensure_product_indexes
+    retries the model's indexes at the start of the next import.
+    """
+    failed = []
+    with connection.cursor() as cursor:
+        for definition in definitions:
+            try:
+                cursor.execute(definition.replace("CREATE INDEX ", "CREATE INDEX CONCURRENTLY IF NOT EXISTS ", 1))
+            except Exception:
+                logger.exception("Failed to rebuild index: %s", definition)
+                failed.append(definition)
+    return failed
+
+
+def _ensure_product_indexes() -> None:
+    """Rebuild products_product's declared indexes if an earlier import lost them.
+
+    A worker killed between _drop_secondary_indexes and _restore_indexes, or
+    a failed concurrent build (which leaves an invalid index behind), would
+    otherwise leave the table without indexes its migrations say exist.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT index_class.relname
+            FROM pg_index
+            JOIN pg_class AS index_class ON index_class.oid = pg_index.indexrelid
+            WHERE pg_index.indrelid = %s::regclass
+              AND pg_index.indisvalid;
+            """,
+            [Product._meta.db_table],
+        )
+        valid_indexes = {name for (name,) in cursor.fetchall()}
+    # atomic=False: CONCURRENTLY index DDL can't run inside a transaction.
+    with connection.schema_editor(atomic=False) as schema_editor:
+        for index in Product._meta.indexes:
+            if index.name in valid_indexes:
+                continue
+            logger.warning("Index %s is missing or invalid; rebuilding it.", index.name)
+            schema_editor.remove_index(Product, index, concurrently=True)
+            schema_editor.add_index(Product, index, concurrently=True)
+
+
+@contextmanager
+def _secondary_indexes_dropped(enabled: bool = True) -> Iterator[None]:
+    """Drop products_product's secondary indexes for the block, then rebuild them.
+
+    A session-level advisory lock is held from the drop until the rebuild, so
+    only one import at a time works without the indexes and no other import's
+    _ensure_product_indexes rebuilds them mid-load. An import that finds the
+    lock taken loads without touching the indexes. Raises RuntimeError if a
+    rebuild fails after the block completes.
+    """
+    if not enabled:
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s);", [INDEX_REBUILD_LOCK_KEY])
+        (locked,) = cursor.fetchone()
+    if not locked:
+        logger.info("Another import is rebuilding the product indexes; leaving them to it.")
+        yield
+        return
+    dropped_indexes: List[str] = []
+    try:
+        _ensure_product_indexes()
+        dropped_indexes = _drop_secondary_indexes()
+        yield
+        definitions, dropped_indexes = dropped_indexes, []
+        failed_indexes = _restore_indexes(definitions)
+        if failed_indexes:
+            raise RuntimeError(f"Failed to rebuild indexes: {'; '.join(failed_indexes)}")
+    finally:
+        if dropped_indexes:
+            _restore_indexes(dropped_indexes)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s);", [INDEX_REBUILD_LOCK_KEY])
+
+
+def _get_normalize_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Return the process pool for normalization, started from the calling thread.
+
+    Call this from the task's main thread before the prefetch thread starts:
+    a fork pool launches every worker on its first submit, and forking while
+    another thread may hold a lock can deadlock the children.
+    """
+    global _normalize_pool
+    if _normalize_pool is None:
+        # Forked children inherit the configured Django settings _normalize_batch needs.
+        pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("fork"),
+        )
+        pool.submit(int).result()  # fork the workers now, from this thread
+        _normalize_pool = pool
+    return _normalize_pool
+
+
+def _map_in_pool(
+    pool: ProcessPoolExecutor, func: Callable, iterable: Iterable, depth: int
+) -> Iterator:
+    """Like ``pool.map`` but keeps at most ``depth`` items in flight, in order."""
+    in_flight: deque = deque()
+    for item in iterable:
+        in_flight.append(pool.submit(func, item))
+        if len(in_flight) >= depth:
+            yield in_flight.popleft().result()
+    while in_flight:
+        yield in_flight.popleft().result()
+
+
+def _create_staging_table(cursor, staging: _StagingSQL) -> None:
+    """Create the session-scoped staging table that collects every batch of an import."""
+    cursor.execute(staging.create)
+    cursor.execute(staging.truncate)
+
+
+def _drop_staging_table(cursor, staging: _StagingSQL) -> None:
+    try:
+        cursor.execute(staging.drop)
+    except Exception:
+        logger.exception("Failed to drop staging table %s", staging.table)
+
+
 def _copy_batch_to_database(
-    batch_rows: List[Dict[str, object]],
-    temp_table_name: str,
+    cursor,
+    batch_rows: List[NormalizedRow],
+    staging: _StagingSQL,
 ) -> None:
+    """COPY rows into the staging table; they are upserted once by _merge_staging_table."""
     if not batch_rows:
         return
 
-    quoted_temp_table = connection.ops.quote_name(temp_table_name)
+    with transaction.atomic():
+        # Don't wait for the WAL flush when each batch commits. A crash can
+        # lose the last few committed batches but never corrupts data, and the
+        # uploaded CSV is kept so the import can simply be re-run.
+        cursor.execute("SET LOCAL synchronous_commit TO off;")
+        stream = _STAGING_COPY_ENCODER.stream(batch_rows)
+        cursor.copy_expert(staging.copy, stream, size=COPY_STREAM_READ_SIZE)
+
 
+def _merge_staging_table(cursor, staging: _StagingSQL) -> None:
+    """Upsert everything staged for the import in a single statement."""
     with transaction.atomic():
-        with connection.cursor() as cursor:
-            create_temp_sql = f"""
-                CREATE TEMP TABLE {quoted_temp_table} (
-                    sku TEXT,
-                    sku_lower TEXT,
-                    name TEXT,
-                    description TEXT,
-                    price NUMERIC(10, 2),
-                    active BOOLEAN,
-                    created_at TIMESTAMPTZ,
-                    updated_at TIMESTAMPTZ
-                ) ON COMMIT DROP;
-            """
-            cursor.execute(create_temp_sql)
-
-            tmp_path: Optional[Path] = None
-
-            with NamedTemporaryFile("w", newline="", delete=False) as tmp_file:
-                writer = csv.writer(tmp_file)
-                writer.writerow(
-                    [
-                        "sku",
-                        "sku_lower",
-                        "name",
-                        "description",
-                        "price",
-                        "active",
-                        "created_at",
-                        "updated_at",
-                    ]
-                )
-                for row in batch_rows:
-                    price_value = Decimal(row["price"])
-                    writer.writerow(
-                        [
-                            row["sku"],
-                            row["sku_lower"],
-                            row["name"],
-                            row["description"],
-                            format(price_value, "f"),
-                            "true" if row["active"] else "false",
-                            row["created_at"],
-                            row["updated_at"],
-                        ]
-                    )
-                tmp_path = Path(tmp_file.name)
+        cursor.execute("SET LOCAL synchronous_commit TO off;")
+        cursor.execute(staging.upsert)
+
+
+def _copy_batch_rows_for(rows: List[NormalizedRow], target_bytes: int, default: int) -> int:
+    """Rows per COPY that make each one about ``target_bytes`` of binary COPY data."""
+    sample = rows[:COPY_SIZE_SAMPLE_ROWS]
+    if not sample or target_bytes <= 0:
+        return default
+    row_width = statistics.median(len(_STAGING_COPY_ENCODER.encode_row(row)) for row in sample)
+    return max(MIN_COPY_BATCH_ROWS, int(target_bytes // row_width))
+
+
+class _JobProgressSQL(NamedTuple):
+    """Prepared UPDATE for an import's progress checkpoints."""
+
+    prepare: str
+    execute: str
+    deallocate: str
+
+
+def _build_job_progress_sql(statement_name: str) -> _JobProgressSQL:
+    quoted_name = connection.ops.quote_name(statement_name)
+    return _JobProgressSQL(
+        prepare=f"""
+            PREPARE {quoted_name} (integer, integer, jsonb, bigint) AS
+            UPDATE {connection.ops.quote_name(UploadJob._meta.db_table)}
+            SET processed_rows = $1,
+                errors_truncated = $2,
+                errors_json = COALESCE(errors_json || $3, errors_json),
+                updated_at = now()
+            WHERE id = $4;
+        """,
+        execute=f"EXECUTE {quoted_name} (%s, %s, %s, %s);",
+        deallocate=f"DEALLOCATE {quoted_name};",
+    )
+
+
+def _upsert_rows_directly(cursor, batch_rows: List[NormalizedRow]) -> None:
+    if not batch_rows:
+        return
+    # VALUES has no row order to DISTINCT ON by; for these few rows just keep
+    # the last occurrence of each SKU here.
+    batch_rows = list({row[0].lower(): row for row in batch_rows}.values())
+    with transaction.atomic():
+        execute_values(
+            cursor.cursor,
+            _DIRECT_UPSERT_SQL,
+            batch_rows,
+            template=_DIRECT_UPSERT_TEMPLATE,
+            page_size=len(batch_rows),
+        )
+
+
+def _copy_rows_into_products(cursor, batch_rows: List[NormalizedRow]) -> None:
+    if not batch_rows:
+        return
+    with transaction.atomic():
+        cursor.execute("SET LOCAL synchronous_commit TO off;")
+        stream = _STAGING_COPY_ENCODER.stream(batch_rows)
+        cursor.copy_expert(_PRODUCT_COPY_SQL, stream, size=COPY_STREAM_READ_SIZE)
+
+
+def _flush_pending_rows(
+    cursor,
+    pending_rows: List[NormalizedRow],
+    staging: Optional[_StagingSQL],
+    direct_copy: bool = False,
+) -> bool:
+    """Load pending rows; returns whether later flushes may still COPY directly."""
+    if direct_copy:
+        try:
+            _copy_rows_into_products(cursor, pending_rows)
+            return True
+        except IntegrityError:
+            # Someone else inserted a colliding SKU meanwhile; the COPY rolled
+            # back, so load these rows (and all later ones) through the upsert.
+            # copy_expert() bypasses Django's error translation, hence
+            # psycopg2's IntegrityError rather than django.db's.
+            logger.info("Direct COPY hit an existing SKU; switching to the staging upsert.")
+    if staging is None:
+        _upsert_rows_directly(cursor, pending_rows)
+    else:
+        _copy_batch_to_database(cursor, pending_rows, staging)
+    return False
+
+
+def _has_repeated_skus(rows: List[NormalizedRow], seen_skus: set) -> bool:
+    """Record the batch's SKUs in ``seen_skus``; True if any was already seen."""
+    batch_skus = [row[0].lower() for row in rows]
+    unique_skus = set(batch_skus)
+    if len(unique_skus) < len(batch_skus) or not seen_skus.isdisjoint(unique_skus):
+        return True
+    seen_skus |= unique_skus
+    return False
+
+
+class _ImportSession:
+    """Database side of a sequential import.
 
+    One cursor serves the whole import: it owns the staging table, the
+    prepared progress statement and the rows waiting for the next COPY.
+    Each COPY still commits on its own (without waiting for the WAL flush),
+    so progress written through the same connection stays visible to the
+    progress endpoints while the import runs.
+    """
+
+    def __init__(
+        self,
+        upload_task_id: str,
+        staging: Optional[_StagingSQL],
+        direct_copy: bool,
+        copy_batch_size: int,
+        copy_target_bytes: int,
+    ) -> None:
+        self.upload_task_id = upload_task_id
+        self.staging = staging
+        self.direct_copy = direct_copy
+        self.copy_batch_size = copy_batch_size
+        self.copy_target_bytes = copy_target_bytes
+        self.job_progress = _build_job_progress_sql(f"upload_job_progress_{upload_task_id}")
+        self.cursor = connection.cursor()
+        self._pending_rows: List[NormalizedRow] = []
+        self._seen_skus: set = set()
+        self._sized = False
+        self._prepared = False
+
+    def open(self) -> None:
+        if self.staging is not None:
+            _create_staging_table(self.cursor, self.staging)
+        # Progress checkpoints skip the ORM and reuse one server-side plan.
+        self.cursor.execute(self.job_progress.prepare)
+        self._prepared = True
+
+    def add_rows(self, rows: List[NormalizedRow]) -> None:
+        """Queue normalized rows, COPYing once a full COPY batch is waiting."""
+        if not self._sized and self.staging is not None:
+            # COPY batches are sized independently of progress batches so
+            # that frequent progress updates don't force small COPYs. Their
+            # row count is fitted to the file's row width on the first batch.
+            self.copy_batch_size = _copy_batch_rows_for(rows, self.copy_target_bytes, self.copy_batch_size)
+            self._sized = True
+        if self.direct_copy and _has_repeated_skus(rows, self._seen_skus):
+            logger.info("Upload %s repeats SKUs; switching to the staging upsert.", self.upload_task_id)
+            self.direct_copy = False
+            self._seen_skus = set()
+        self._pending_rows.extend(rows)
+        if len(self._pending_rows) >= self.copy_batch_size:
+            self._flush()
+
+    def finish(self) -> None:
+        """Load the remaining rows and upsert everything staged."""
+        self._flush()
+        if self.staging is not None:
+            _merge_staging_table(self.cursor, self.staging)
+
+    def write_progress(
+        self, job_id: int, processed_rows: int, errors_truncated: int, new_errors_json: Optional[str]
+    ) -> None:
+        self.cursor.execute(self.job_progress.execute, (processed_rows, errors_truncated, new_errors_json, job_id))
+
+    def close(self) -> None:
+        if self.staging is not None:
+            _drop_staging_table(self.cursor, self.staging)
+        if self._prepared:
             try:
-                if tmp_path is None:
-                    raise RuntimeError("Temporary file path was not created for batch load.")
-                with tmp_path.open("r", newline="") as read_handle:
-                    copy_sql = f"""
-                        COPY {quoted_temp_table} (sku, sku_lower, name, description, price, active, created_at, updated_at)
-                        FROM STDIN WITH CSV HEADER;
-                    """
-                    cursor.copy_expert(copy_sql, read_handle)
-
-                upsert_sql = f"""
-                    INSERT INTO products_product (sku, name, description, price, active, created_at, updated_at)
-                    SELECT
-                        sku,
-                        name,
-                        description,
-                        price,
-                        active,
-                        created_at,
-                        updated_at
-                    FROM {quoted_temp_table}
-                    ON CONFLICT ((lower(sku)))
-                    DO UPDATE SET
-                        name = EXCLUDED.name,
-                        description = EXCLUDED.description,
-                        price = EXCLUDED.price,
-                        active = EXCLUDED.active,
-                        updated_at = EXCLUDED.updated_at;
-                """
-                cursor.execute(upsert_sql)
-            finally:
-                # Clean up temp file. Temp table will be auto-dropped by ON COMMIT DROP
-                try:
-                    if tmp_path is not None:
-                        tmp_path.unlink(missing_ok=True)
-                except FileNotFoundError:
-                    pass
+                self.cursor.execute(self.job_progress.deallocate)
+            except Exception:
+                logger.exception("Failed to deallocate progress statement for upload %s", self.upload_task_id)
+        self.cursor.close()
+
+    def _flush(self) -> None:
+        self.direct_copy = _flush_pending_rows(self.cursor, self._pending_rows, self.staging, self.direct_copy)
+        self._pending_rows = []
 
 
 @shared_task(bind=True, name="products.import_csv_task")
@@ -283,25 +752,41 @@ def import_csv_task(self, upload_task_id: str, file_path: str, user_id: Optional
         )
         return
 
-    batch_size = getattr(settings, "PRODUCT_IMPORT_BATCH_SIZE", 5000)
-    loader = CSVBatchLoader(csv_path, batch_size=batch_size)
+    import_settings = settings.PRODUCT_IMPORT
+    batch_size = import_settings["batch_size"]
+    copy_batch_size = import_settings["copy_batch_size"]
+    copy_target_bytes = import_settings["copy_target_bytes"]
+    max_errors = import_settings["max_errors"]
+    parallel_normalize = import_settings["parallel_normalize"]
+    parallel_chunks = import_settings["parallel_chunks"]
+    index_rebuild_threshold = import_settings["index_rebuild_threshold"]
+    loader = CSVBatchLoader(csv_path, batch_size=batch_size, columns=IMPORT_COLUMNS)
 
     job.status = UploadJob.Status.IN_PROGRESS
     job.processed_rows = 0
     job.total_rows = loader.count_rows()
     job.errors_json = []
-    job.save(update_fields=["status", "processed_rows", "total_rows", "errors_json", "updated_at"])
+    job.errors_truncated = 0
+    job.save(
+        update_fields=["status", "processed_rows", "total_rows", "errors_json", "errors_truncated", "updated_at"]
+    )
 
     total_rows = job.total_rows or 0
     processed_rows = 0
     error_count = 0
     error_details: List[Dict[str, object]] = []
+    errors_truncated = 0
+    unsaved_error_details: List[Dict[str, object]] = []
+    last_progress_ts = time.monotonic()
+    last_reported_percent = 0
+    progress_reports = 0
 
     logger.info(
-        "Upload %s contains %s data rows (batch size %s).",
+        "Upload %s contains %s data rows (batch size %s, COPY batch size %s).",
         upload_task_id,
         total_rows,
         batch_size,
+        copy_batch_size,
     )
 
     initial_payload = _write_upload_progress(
@@ -314,62 +799,131 @@ def import_csv_task(self, upload_task_id: str, file_path: str, user_id: Optional
     )
     self.update_state(state="PROGRESS", meta=initial_payload)
 
+    session: Optional[_ImportSession] = None
+    normalized_batches = None
     try:
-        for batch_index, batch in enumerate(loader, start=1):
-            normalized_rows: List[Dict[str, object]] = []
-            for row_number, row in batch:
-                processed_rows += 1
-                normalized, error = _normalize_row(row_number, row)
-                if error:
+        # A truncate_before upload that goes parallel is truncated inside the
+        # merge transaction by merge_import_chunks_task.
+        if (
+            parallel_chunks > 1
+            and total_rows >= copy_batch_size
+            and _dispatch_parallel_import(upload_task_id, csv_path, loader, parallel_chunks)
+        ):
+            logger.info("Upload %s split into parallel chunk imports.", upload_task_id)
+            return
+
+        # Tiny (or empty) files skip the staging table entirely and are upserted
+        # with a single INSERT ... VALUES.
+        if total_rows < SMALL_IMPORT_THRESHOLD:
+            staging = None
+        else:
+            staging = _build_staging_sql(STAGING_TABLE_NAME)
+        # With nothing to conflict with, skip the staging table and upsert and
+        # COPY straight into products_product until the file repeats a SKU.
+        direct_copy = staging is not None and (job.truncate_before or not Product.objects.exists())
+        session = _ImportSession(upload_task_id, staging, direct_copy, copy_batch_size, copy_target_bytes)
+        # Large loads build secondary indexes once at the end instead of
+        # updating them row by row. The index context is entered outside the
+        # load transaction: CONCURRENTLY index DDL can't run inside one.
+        # Replacing the catalogue loads in one transaction with its TRUNCATE,
+        # so a failed import leaves the previous products in place. Until it
+        # commits, products_product stays locked and job checkpoints are only
+        # visible over the WebSocket.
+        with (
+            _secondary_indexes_dropped(staging is not None and 0 < index_rebuild_threshold <= total_rows),
+            transaction.atomic() if job.truncate_before else nullcontext(),
+        ):
+            if job.truncate_before:
+                logger.info("Truncating products before upload %s.", upload_task_id)
+                with connection.cursor() as truncate_cursor:
+                    truncate_cursor.execute(_TRUNCATE_PRODUCTS_SQL)
+            session.open()
+            # Parse and normalize the next batches on a background thread while
+            # this one waits on COPY and progress writes.
+            # Every row of an import shares one created_at/updated_at timestamp.
+            normalize = partial(_normalize_batch, now=timezone.now())
+            if parallel_normalize:
+                workers = max(1, import_settings["normalize_workers"])
+                # The pool is created here, on the task's thread; _map_in_pool
+                # only submits to it from the prefetch thread.
+                pool = _get_normalize_pool(workers)
+                normalized = _map_in_pool(pool, normalize, loader, depth=workers * 2)
+            else:
+                normalized = map(normalize, loader)
+            normalized_batches = prefetch(normalized, depth=NORMALIZE_PREFETCH_DEPTH)
+            for batch_index, (row_count, normalized_rows, batch_error_details) in enumerate(
+                normalized_batches, start=1
+            ):
+                processed_rows += row_count
+                batch_errors: List[UploadJobError] = []
+                for error in batch_error_details:
                     error_count += 1
-                    if len(error_details) < MAX_ERROR_RECORDS:
+                    batch_errors.append(UploadJobError(job=job, row_index=error["row"], message=error["error"]))
+                    if len(error_details) < max_errors:
                         error_details.append(error)
-                    continue
-                normalized_rows.append(normalized)
-
-            # Deduplicate by SKU (case-insensitive) - keep last occurrence
-            # This prevents "ON CONFLICT DO UPDATE cannot affect row a second time" errors
-            # when the same batch contains duplicate SKUs
-            seen_skus = {}
-            for row in normalized_rows:
-                sku_lower = row["sku_lower"]
-                seen_skus[sku_lower] = row  # Last occurrence wins
-            deduplicated_rows = list(seen_skus.values())
-
-            temp_table_name = f"tmp_products_upload_{upload_task_id[:8]}_{batch_index}"
-            _copy_batch_to_database(deduplicated_rows, temp_table_name)
-
-            job.processed_rows = processed_rows
-            job.errors_json = error_details[:MAX_ERROR_RECORDS]
-            job.save(update_fields=["processed_rows", "errors_json", "updated_at"])
-
-            percent = _calculate_percent(processed_rows, total_rows)
-            payload = _write_upload_progress(
-                upload_task_id,
-                status="in_progress",
-                processed=processed_rows,
-                total=total_rows,
-                percent=percent,
-                errors=error_count,
-            )
-            self.update_state(state="PROGRESS", meta=payload)
-            queue_event(
-                Webhook.EVENT_IMPORT_PROGRESS,
-                {
-                    "event": Webhook.EVENT_IMPORT_PROGRESS,
-                    "task_id": upload_task_id,
-                    "batch_index": batch_index,
-                    "processed": processed_rows,
-                    "total": total_rows,
-                    "errors": error_count,
-                    "timestamp": timezone.now().isoformat(),
-                },
-            )
+                        unsaved_error_details.append(error)
+                    else:
+                        errors_truncated += 1
+
+                if batch_errors:
+                    UploadJobError.objects.bulk_create(batch_errors, batch_size=500)
+
+                session.add_rows(normalized_rows)
+
+                # Throttle job/progress/webhook updates: report once the percentage
+                # has moved (at most every PROGRESS_UPDATE_INTERVAL_SECONDS), or as
+                # a heartbeat. The completion and failure paths below always write
+                # the final state.
+                now_ts = time.monotonic()
+                elapsed = now_ts - last_progress_ts
+                percent = calculate_percent(processed_rows, total_rows)
+                if processed_rows < total_rows and (
+                    (elapsed >= PROGRESS_UPDATE_INTERVAL_SECONDS and percent > last_reported_percent)
+                    or elapsed >= PROGRESS_HEARTBEAT_SECONDS
+                ):
+                    last_progress_ts = now_ts
+                    last_reported_percent = percent
+                    progress_reports += 1
+                    payload = _write_upload_progress(
+                        upload_task_id,
+                        status="in_progress",
+                        processed=processed_rows,
+                        total=total_rows,
+                        percent=percent,
+                        errors=error_count,
+                    )
+                    if progress_reports % PROGRESS_DB_CHECKPOINT_EVERY == 0:
+                        # NULL leaves errors_json untouched when no new errors were kept.
+                        new_errors_json = None
+                        if unsaved_error_details:
+                            new_errors_json = orjson.dumps(unsaved_error_details).decode()
+                        session.write_progress(job.pk, processed_rows, errors_truncated, new_errors_json)
+                        unsaved_error_details = []
+                        self.update_state(state="PROGRESS", meta=payload)
+                    queue_event(
+                        Webhook.EVENT_IMPORT_PROGRESS,
+                        {
+                            "event": Webhook.EVENT_IMPORT_PROGRESS,
+                            "task_id": upload_task_id,
+                            "batch_index": batch_index,
+                            "processed": processed_rows,
+                            "total": total_rows,
+                            "errors": error_count,
+                            "timestamp": timezone.now().isoformat(),
+                        },
+                    )
+
+            session.finish()
 
         job.status = UploadJob.Status.COMPLETED
         job.processed_rows = processed_rows
-        job.errors_json = error_details
-        job.save(update_fields=["status", "processed_rows", "errors_json", "updated_at"])
+        job.errors_truncated = errors_truncated
+        update_fields = ["status", "processed_rows", "errors_truncated", "updated_at"]
+        if unsaved_error_details:
+            # error_details is bounded by max_errors as it is built.
+            job.errors_json = error_details
+            update_fields.append("errors_json")
+        job.save(update_fields=update_fields)
 
         final_payload = _write_upload_progress(
             upload_task_id,
@@ -405,15 +959,17 @@ def import_csv_task(self, upload_task_id: str, file_path: str, user_id: Optional
             },
         )
         job.status = UploadJob.Status.FAILED
-        job.errors_json = error_details[:MAX_ERROR_RECORDS]
-        job.save(update_fields=["status", "errors_json", "updated_at"])
+        job.processed_rows = processed_rows
+        job.errors_json = error_details[:max_errors]
+        job.errors_truncated = errors_truncated
+        job.save(update_fields=["status", "processed_rows", "errors_json", "errors_truncated", "updated_at"])
 
         failure_payload = _write_upload_progress(
             upload_task_id,
             status="failed",
             processed=processed_rows,
             total=total_rows,
-            percent=_calculate_percent(processed_rows, total_rows),
+            percent=calculate_percent(processed_rows, total_rows),
             errors=error_count,
             error=str(exc),
         )
@@ -432,6 +988,270 @@ def import_csv_task(self, upload_task_id: str, file_path: str, user_id: Optional
             },
         )
         raise
+    finally:
+        if normalized_batches is not None:
+            normalized_batches.close()  # stops the prefetch thread on failure
+        if session is not None:
+            session.close()
+
+
+def _chunk_table_name(upload_task_id: str, index: int) -> str:
+    return f"products_import_{upload_task_id}_{index}"
+
+
+def _drop_chunk_tables(table_names: List[str]) -> None:
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "DROP TABLE IF EXISTS "
+                + ", ".join(connection.ops.quote_name(name) for name in table_names)
+                + ";"
+            )
+    except Exception:
+        logger.exception("Failed to drop chunk tables %s", table_names)
+
+
+def _dispatch_parallel_import(upload_task_id: str, csv_path: Path, loader: CSVBatchLoader, parts: int) -> bool:
+    """Fan the file out to ``copy_import_chunk_task`` workers; False if it can't be split."""
+    ranges = loader.split(parts)
+    if len(ranges) < 2:
+        return False
+    table_names = [_chunk_table_name(upload_task_id, index) for index in range(len(ranges))]
+    next_line_numbers = [first_line_number for _, _, first_line_number in ranges[1:]] + [None]
+    imported_at = timezone.now().isoformat()
+    header = group(
+        [
+            copy_import_chunk_task.s(
+                upload_task_id, str(csv_path), start, end, first_line_number, table_name, imported_at, next_line_number
+            )
+            for (start, end, first_line_number), table_name, next_line_number in zip(
+                ranges, table_names, next_line_numbers
+            )
+        ]
+    )
+    callback = merge_import_chunks_task.s(upload_task_id, table_names).on_error(
+        fail_parallel_import_task.s(upload_task_id, table_names)
+    )
+    chord(header)(callback)
+    return True
+
+
+def _reset_chunk_table(
+    cursor, job_id: int, table_name: str, first_line_number: int, next_line_number: Optional[int]
+) -> None:
+    """Create a chunk's table empty, undoing whatever an earlier delivery of the chunk committed.
+
+    Each chunk batch commits its rows, its errors and its processed_rows
+    increment together, so the rows left in the table plus the chunk's errors
+    are exactly what the earlier attempt added to processed_rows.
+    """
+    quoted_table = connection.ops.quote_name(table_name)
+    with transaction.atomic():
+        cursor.execute("SELECT to_regclass(%s);", [quoted_table])
+        (existing_table,) = cursor.fetchone()
+        if existing_table is not None:
+            cursor.execute(f"SELECT count(*) FROM {quoted_table};")
+            (staged_rows,) = cursor.fetchone()
+            chunk_errors = UploadJobError.objects.filter(job_id=job_id, row_index__gte=first_line_number)
+            if next_line_number is not None:
+                chunk_errors = chunk_errors.filter(row_index__lt=next_line_number)
+            error_rows, _ = chunk_errors.delete()
+            if staged_rows or error_rows:
+                logger.info("Chunk table %s exists from an earlier attempt; discarding it.", table_name)
+                cursor.execute(
+                    f"UPDATE {connection.ops.quote_name(UploadJob._meta.db_table)} "
+                    "SET processed_rows = processed_rows - %s WHERE id = %s;",
+                    [staged_rows + error_rows, job_id],
+                )
+            cursor.execute(f"DROP TABLE {quoted_table};")
+        cursor.execute(f"CREATE UNLOGGED TABLE {quoted_table} ({_staging_column_definitions()});")
+
+
+@shared_task(bind=True, name="products.copy_import_chunk_task")
+def copy_import_chunk_task(
+    self,
+    upload_task_id: str,
+    file_path: str,
+    start: int,
+    end: int,
+    first_line_number: int,
+    table_name: str,
+    imported_at: str,
+    next_line_number: Optional[int] = None,
+) -> int:
+    """COPY one byte range of an upload into its own UNLOGGED chunk table.
+
+    Chunk tables are regular (unlogged) tables rather than TEMP ones because
+    the merge runs in a different worker session. Redelivered chunks start
+    over from an empty table (see _reset_chunk_table).
+    """
+    job = UploadJob.objects.only("id", "total_rows").get(task_id=upload_task_id)
+    import_settings = settings.PRODUCT_IMPORT
+    loader = CSVBatchLoader(
+        file_path,
+        batch_size=import_settings["batch_size"],
+        columns=IMPORT_COLUMNS,
+        byte_range=(start, end),
+        first_line_number=first_line_number,
+    )
+    quoted_table = connection.ops.quote_name(table_name)
+    copy_sql = f"COPY {quoted_table} ({', '.join(_STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT BINARY);"
+    progress_sql = (
+        f"UPDATE {connection.ops.quote_name(UploadJob._meta.db_table)} "
+        "SET processed_rows = processed_rows + %s, updated_at = now() WHERE id = %s "
+        "RETURNING processed_rows;"
+    )
+    normalize = partial(_normalize_batch, now=datetime.fromisoformat(imported_at))
+    imported_rows = 0
+    # Errors found by this chunk; other chunks' errors are only summed by the merge.
+    error_count = 0
+    last_progress_ts = time.monotonic()
+
+    with connection.cursor() as cursor:
+        _reset_chunk_table(cursor, job.pk, table_name, first_line_number, next_line_number)
+        for row_count, normalized_rows, batch_error_details in prefetch(map(normalize, loader)):
+            with transaction.atomic():
+                cursor.execute("SET LOCAL synchronous_commit TO off;")
+                if batch_error_details:
+                    UploadJobError.objects.bulk_create(
+                        [
+                            UploadJobError(job=job, row_index=error["row"], message=error["error"])
+                            for error in batch_error_details
+                        ],
+                        batch_size=500,
+                    )
+                if normalized_rows:
+                    stream = _STAGING_COPY_ENCODER.stream(normalized_rows)
+                    cursor.copy_expert(copy_sql, stream, size=COPY_STREAM_READ_SIZE)
+                cursor.execute(progress_sql, (row_count, job.pk))
+                (processed_rows,) = cursor.fetchone()
+            imported_rows += row_count
+            error_count += len(batch_error_details)
+
+            now_ts = time.monotonic()
+            if now_ts - last_progress_ts >= PROGRESS_UPDATE_INTERVAL_SECONDS:
+                last_progress_ts = now_ts
+                _write_upload_progress(
+                    upload_task_id,
+                    status="in_progress",
+                    processed=processed_rows,
+                    total=job.total_rows,
+                    percent=calculate_percent(processed_rows, job.total_rows),
+                    errors=error_count,
+                )
+    return imported_rows
+
+
+@shared_task(bind=True, name="products.merge_import_chunks_task")
+def merge_import_chunks_task(self, chunk_rows: List[int], upload_task_id: str, table_names: List[str]) -> None:
+    """Upsert every chunk table into products_product in one statement and finish the job."""
+    job = UploadJob.objects.get(task_id=upload_task_id)
+    import_settings = settings.PRODUCT_IMPORT
+    max_errors = import_settings["max_errors"]
+    index_rebuild_threshold = import_settings["index_rebuild_threshold"]
+    columns = ", ".join(_STAGING_COLUMNS)
+    staged = " UNION ALL ".join(
+        f"SELECT {columns}, {index} AS chunk_index, ctid AS chunk_ctid FROM {connection.ops.quote_name(name)}"
+        for index, name in enumerate(table_names)
+    )
+    # Later chunks, then later rows within a chunk, win - the same "last
+    # occurrence" rule as the sequential import.
+    merge_sql = f"""
+        INSERT INTO products_product ({columns})
+        SELECT DISTINCT ON (LOWER(sku)) {columns}
+        FROM ({staged}) AS staged
+        ORDER BY LOWER(sku), chunk_index DESC, chunk_ctid DESC
+        {_PRODUCT_UPSERT_CONFLICT_SQL};
+    """
+    try:
+        with (
+            _secondary_indexes_dropped(0 < index_rebuild_threshold <= (job.total_rows or 0)),
+            transaction.atomic(),
+            connection.cursor() as cursor,
+        ):
+            cursor.execute("SET LOCAL synchronous_commit TO off;")
+            if job.truncate_before:
+                # In the merge's transaction, so a failed merge keeps the old catalogue.
+                cursor.execute(_TRUNCATE_PRODUCTS_SQL)
+            cursor.execute(merge_sql)
+    except Exception as exc:
+        logger.exception("Failed to merge chunk tables for upload %s", upload_task_id)
+        _fail_parallel_import(upload_task_id, exc)
+        raise
+    finally:
+        _drop_chunk_tables(table_names)
+
+    processed_rows = sum(chunk_rows)
+    row_errors = UploadJobError.objects.filter(job_id=job.pk)
+    error_count = row_errors.count()
+    job.status = UploadJob.Status.COMPLETED
+    job.processed_rows = processed_rows
+    job.errors_json = [
+        {"row": row_index, "error": message}
+        for row_index, message in row_errors.values_list("row_index", "message")[:max_errors]
+    ]
+    job.errors_truncated = max(0, error_count - max_errors)
+    job.save(update_fields=["status", "processed_rows", "errors_json", "errors_truncated", "updated_at"])
+
+    _write_upload_progress(
+        upload_task_id,
+        status="completed",
+        processed=processed_rows,
+        total=job.total_rows,
+        percent=100,
+        errors=error_count,
+    )
+    queue_event(
+        Webhook.EVENT_IMPORT_COMPLETED,
+        {
+            "event": Webhook.EVENT_IMPORT_COMPLETED,
+            "task_id": upload_task_id,
+            "total": job.total_rows,
+            "processed": processed_rows,
+            "errors": error_count,
+            "status": "completed",
+            "timestamp": timezone.now().isoformat(),
+        },
+    )
+    logger.info("Completed parallel import task_id=%s", upload_task_id)
+
+
+@shared_task(name="products.fail_parallel_import_task")
+def fail_parallel_import_task(request, exc, exc_traceback, upload_task_id: str, table_names: List[str]) -> None:
+    """Chord error callback: a chunk failed, so mark the upload failed and clean up."""
+    logger.error("Parallel import %s failed: %s", upload_task_id, exc)
+    _drop_chunk_tables(table_names)
+    _fail_parallel_import(upload_task_id, exc)
+
+
+def _fail_parallel_import(upload_task_id: str, exc: BaseException) -> None:
+    job = UploadJob.objects.filter(task_id=upload_task_id).first()
+    if job is None or job.status == UploadJob.Status.FAILED:
+        return
+    job.status = UploadJob.Status.FAILED
+    job.errors_json = [{"error": str(exc)}]
+    job.save(update_fields=["status", "errors_json", "updated_at"])
+    _write_upload_progress(
+        upload_task_id,
+        status="failed",
+        processed=job.processed_rows,
+        total=job.total_rows,
+        percent=calculate_percent(job.processed_rows, job.total_rows),
+        errors=UploadJobError.objects.filter(job_id=job.pk).count() + 1,
+        error=str(exc),
+    )
+    queue_event(
+        Webhook.EVENT_IMPORT_COMPLETED,
+        {
+            "event": Webhook.EVENT_IMPORT_COMPLETED,
+            "task_id": upload_task_id,
+            "total": job.total_rows,
+            "processed": job.processed_rows,
+            "status": "failed",
+            "error": str(exc),
+            "timestamp": timezone.now().isoformat(),
+        },
+    )
 
 
 @shared_task(bind=True, name="products.bulk_delete_products_task")
@@ -453,7 +1273,9 @@ def bulk_delete_products_task(self, job_id: int, user_id: Optional[int] = None)
         )
         return
 
-    total = Product.objects.count()
+    # An estimate is enough to pick truncate vs. batches and to scale progress;
+    # the batched path reports the exact number it deleted.
+    total = estimate_product_count()
     job.status = DeletionJob.Status.IN_PROGRESS
     job.total_count = total
     job.deleted_count = 0
@@ -474,8 +1296,9 @@ def bulk_delete_products_task(self, job_id: int, user_id: Optional[int] = None)
         self.update_state(state="SUCCESS", meta=payload)
         return
 
-    batch_size = getattr(settings, "PRODUCT_DELETE_BATCH_SIZE", 1000)
-    truncate_threshold = getattr(settings, "PRODUCT_DELETE_TRUNCATE_THRESHOLD", 200000)
+    import_settings = settings.PRODUCT_IMPORT
+    batch_size = import_settings["delete_batch_size"]
+    truncate_threshold = import_settings["delete_truncate_threshold"]
     deleted_count = 0
     errors = 0
 
@@ -484,7 +1307,7 @@ def bulk_delete_products_task(self, job_id: int, user_id: Optional[int] = None)
         status="in_progress",
         processed=deleted_count,
         total=total,
-        percent=_calculate_percent(deleted_count, total),
+        percent=calculate_percent(deleted_count, total),
         errors=errors,
     )
     self.update_state(state="PROGRESS", meta=payload)
@@ -493,7 +1316,7 @@ def bulk_delete_products_task(self, job_id: int, user_id: Optional[int] = None)
         if total >= truncate_threshold:
             logger.info("Truncating products_product table (total=%s exceeds threshold=%s).", total, truncate_threshold)
             with connection.cursor() as cursor:
-                cursor.execute("TRUNCATE TABLE products_product RESTART IDENTITY CASCADE;")
+                cursor.execute(_TRUNCATE_PRODUCTS_SQL)
             deleted_count = total
         else:
             logger.info(
@@ -502,11 +1325,25 @@ def bulk_delete_products_task(self, job_id: int, user_id: Optional[int] = None)
                 total,
                 truncate_threshold,
             )
+            # Nothing references products and no delete signals are hooked
+            # up, so on PostgreSQL skip the ORM collector and delete each
+            # batch by physical row id in a single statement.
+            product_table = connection.ops.quote_name(Product._meta.db_table)
+            delete_sql = (
+                f"DELETE FROM {product_table} "
+                f"WHERE ctid = ANY (ARRAY(SELECT ctid FROM {product_table} LIMIT %s));"
+            )
+            use_ctid = connection.vendor == "postgresql"
             while True:
-                ids = list(Product.objects.values_list("pk", flat=True)[:batch_size])
-                if not ids:
+                if use_ctid:
+                    with connection.cursor() as cursor:
+                        cursor.execute(delete_sql, [batch_size])
+                        deleted_batch = cursor.rowcount
+                else:
+                    ids = list(Product.objects.order_by().values_list("pk", flat=True)[:batch_size])
+                    deleted_batch, _ = Product.objects.filter(pk__in=ids).delete() if ids else (0, {})
+                if not deleted_batch:
                     break
-                deleted_batch, _ = Product.objects.filter(pk__in=ids).delete()
                 deleted_count += deleted_batch
                 job.deleted_count = deleted_count
                 job.save(update_fields=["deleted_count", "updated_at"])
@@ -516,14 +1353,16 @@ def bulk_delete_products_task(self, job_id: int, user_id: Optional[int] = None)
                 status="in_progress",
                 processed=deleted_count,
                 total=total,
-                percent=_calculate_percent(deleted_count, total),
+                percent=calculate_percent(deleted_count, total),
                 errors=errors,
             )
             self.update_state(state="PROGRESS", meta=payload)
+            total = deleted_count
 
         job.status = DeletionJob.Status.COMPLETED
+        job.total_count = total
         job.deleted_count = deleted_count
-        job.save(update_fields=["status", "deleted_count", "updated_at"])
+        job.save(update_fields=["status", "total_count", "deleted_count", "updated_at"])
 
         payload = publish_delete_progress(
             job_id,
@@ -547,7 +1386,7 @@ def bulk_delete_products_task(self, job_id: int, user_id: Optional[int] = None)
             status="failed",
             processed=deleted_count,
             total=total,
-            percent=_calculate_percent(deleted_count, total),
+            percent=calculate_percent(deleted_count, total),
             errors=errors,
             error=str(exc),
         )
@@ -0,0 +1,40 @@
+import asyncio
+import contextlib
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from products.consumers import DeletionProgressConsumer, UploadProgressConsumer
+
+
+@mock.patch("products.consumers.PROGRESS_FLUSH_INTERVAL_SECONDS", 0.01)
+class CoalescingProgressConsumerTests(SimpleTestCase):
+    async def run_consumer(self, consumer_class, handler, events, gap=0.0):
+        consumer = consumer_class()
+        consumer._pending = asyncio.Queue(maxsize=1)
+        consumer.send = mock.AsyncMock()
+        flush_task = asyncio.create_task(consumer._flush_loop())
+        try:
+            for event in events:
+                await getattr(consumer, handler)(event)
+                await asyncio.sleep(gap)
+            await asyncio.sleep(0.05)
+        finally:
+            flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await flush_task
+        return [call.kwargs["bytes_data"] for call in consumer.send.await_args_list]
+
+    async def test_burst_sends_only_latest_frame(self):
+        events = [{"type": "upload.progress", "bytes": b'{"processed":%d}' % i} for i in range(50)]
+        sent = await self.run_consumer(UploadProgressConsumer, "upload_progress", events)
+        self.assertEqual(sent, [b'{"processed":49}'])
+
+    async def test_frames_apart_are_all_sent(self):
+        events = [{"type": "deletion.progress", "bytes": frame} for frame in (b"1", b"2")]
+        sent = await self.run_consumer(DeletionProgressConsumer, "deletion_progress", events, gap=0.05)
+        self.assertEqual(sent, [b"1", b"2"])
+
+    async def test_missing_bytes_sends_empty_object(self):
+        sent = await self.run_consumer(DeletionProgressConsumer, "deletion_progress", [{"type": "deletion.progress"}])
+        self.assertEqual(sent, [b"{}"])
@@ -0,0 +1,92 @@
+import csv
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from products.utils.csv_batch_loader import CSVBatchLoader
+
+COLUMNS = {"sku": "", "name": ""}
+
+
+class CSVBatchLoaderTests(SimpleTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def write(self, text: str) -> Path:
+        path = Path(self._tmp.name) / "products.csv"
+        path.write_text(text, encoding="utf-8", newline="")
+        return path
+
+    def parsed_rows(self, path: Path) -> int:
+        with path.open(newline="", encoding="utf-8") as csvfile:
+            return sum(map(bool, csv.reader(csvfile))) - 1
+
+    def sequential_rows(self, path: Path):
+        loader = CSVBatchLoader(path, batch_size=7, columns=COLUMNS)
+        return [row for batch in loader.iter_batches() for _, row in batch]
+
+    def split_rows(self, path: Path, parts: int):
+        rows = []
+        for start, end, first_line_number in CSVBatchLoader(path, columns=COLUMNS).split(parts):
+            loader = CSVBatchLoader(
+                path,
+                batch_size=7,
+                columns=COLUMNS,
+                byte_range=(start, end),
+                first_line_number=first_line_number,
+            )
+            rows.extend(row for batch in loader.iter_batches() for _, row in batch)
+        return rows
+
+    def test_count_rows_plain(self):
+        path = self.write("sku,name\na,1\nb,2\nc,3")  # no trailing newline
+        self.assertEqual(CSVBatchLoader(path).count_rows(), 3)
+
+    def test_count_rows_empty_and_header_only(self):
+        self.assertEqual(CSVBatchLoader(self.write("")).count_rows(), 0)
+        self.assertEqual(CSVBatchLoader(self.write("sku,name\n")).count_rows(), 0)
+
+    def test_count_rows_subtracts_quoted_newlines(self):
+        path = self.write("sku,name\n" + "".join(f'{i},"two\nlines ""quoted"""\n' for i in range(50)))
+        self.assertEqual(CSVBatchLoader(path).count_rows(), 50)
+        self.assertEqual(CSVBatchLoader(path, has_quoted_newlines=False).count_rows(), 100)
+
+    def test_count_rows_ignores_stray_quotes(self):
+        path = self.write("sku,name\n" + "".join(f'{i},27" monitor\n' for i in range(1000)))
+        self.assertEqual(CSVBatchLoader(path).count_rows(), 1000)
+        self.assertEqual(CSVBatchLoader(path, has_quoted_newlines=True).count_rows(), 1000)
+
+    def test_count_rows_quotes_past_the_start_of_the_file(self):
+        plain = "".join(f"{i},plain\n" for i in range(10000))
+        path = self.write("sku,name\n" + plain + 'x,"late\nnewline"\n')
+        self.assertEqual(CSVBatchLoader(path).count_rows(), self.parsed_rows(path))
+
+    def test_count_rows_mixed_quotes_matches_parse(self):
+        lines = [f'{i},"a, ""b""\nc"\n' if i % 3 else f'{i},5" x "y\n' for i in range(300)]
+        path = self.write("sku,name\n" + "".join(lines))
+        self.assertEqual(CSVBatchLoader(path).count_rows(), self.parsed_rows(path))
+
+    def test_split_covers_rows_in_order(self):
+        path = self.write("sku,name\n" + "".join(f"{i},name {i}\n" for i in range(100)))
+        ranges = CSVBatchLoader(path, columns=COLUMNS).split(4)
+        self.assertEqual(len(ranges), 4)
+        self.assertEqual(ranges[0][2], 2)
+        for (_, end, _), (start, _, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+        self.assertEqual(ranges[-1][1], path.stat().st_size)
+        self.assertEqual(self.split_rows(path, 4), self.sequential_rows(path))
+
+    def test_split_keeps_quoted_newlines_together(self):
+        path = self.write("sku,name\n" + "".join(f'{i},"multi\nline\n{i}"\n' for i in range(200)))
+        self.assertEqual(self.split_rows(path, 5), self.sequential_rows(path))
+
+    def test_split_with_stray_quotes(self):
+        lines = [f'{i},27" monitor\n' if i % 2 else f'{i},"quoted\nname"\n' for i in range(200)]
+        path = self.write("sku,name\n" + "".join(lines))
+        self.assertEqual(self.split_rows(path, 3), self.sequential_rows(path))
+
+    def test_split_empty_files(self):
+        self.assertEqual(CSVBatchLoader(self.write(""), columns=COLUMNS).split(4), [])
+        self.assertEqual(CSVBatchLoader(self.write("sku,name\n"), columns=COLUMNS).split(4), [])
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+
+from django.test import SimpleTestCase
+
+from products.utils.pg_binary_copy import (
+    COPY_HEADER,
+    COPY_TRAILER,
+    BinaryCopyEncoder,
+    encode_bool,
+    encode_numeric_cents,
+    encode_text,
+    encode_timestamptz,
+)
+
+
+class FieldEncoderTests(SimpleTestCase):
+    def test_encode_text(self):
+        self.assertEqual(encode_text("abc"), b"\x00\x00\x00\x03abc")
+        self.assertEqual(encode_text(""), b"\x00\x00\x00\x00")
+        # The length prefix counts UTF-8 bytes, not characters.
+        self.assertEqual(encode_text("é"), b"\x00\x00\x00\x02\xc3\xa9")
+
+    def test_encode_bool(self):
+        self.assertEqual(encode_bool(True), b"\x00\x00\x00\x01\x01")
+        self.assertEqual(encode_bool(False), b"\x00\x00\x00\x01\x00")
+
+    def test_encode_timestamptz(self):
+        epoch = datetime(2000, 1, 1, tzinfo=timezone.utc)
+        self.assertEqual(encode_timestamptz(epoch), b"\x00\x00\x00\x08" + b"\x00" * 8)
+        self.assertEqual(
+            encode_timestamptz(epoch + timedelta(seconds=1)),
+            b"\x00\x00\x00\x08\x00\x00\x00\x00\x00\x0f\x42\x40",
+        )
+        self.assertEqual(
+            encode_timestamptz(epoch - timedelta(seconds=1)),
+            b"\x00\x00\x00\x08\xff\xff\xff\xff\xff\xf0\xbd\xc0",
+        )
+        # Offsets are normalized to UTC.
+        plus_one = timezone(timedelta(hours=1))
+        self.assertEqual(encode_timestamptz(datetime(2000, 1, 1, 1, tzinfo=plus_one)), encode_timestamptz(epoch))
+
+    def test_encode_numeric_cents(self):
+        # length, ndigits, weight, sign, dscale, then base-10000 digit groups
+        self.assertEqual(
+            encode_numeric_cents(0),
+            b"\x00\x00\x00\x08\x00\x00\x00\x00\x00\x00\x00\x02",
+        )
+        self.assertEqual(
+            encode_numeric_cents(1234),  # 12.34
+            b"\x00\x00\x00\x0c\x00\x02\x00\x00\x00\x00\x00\x02\x00\x0c\x0d\x48",
+        )
+        self.assertEqual(
+            encode_numeric_cents(-5),  # -0.05
+            b"\x00\x00\x00\x0a\x00\x01\xff\xff\x40\x00\x00\x02\x01\xf4",
+        )
+        self.assertEqual(
+            encode_numeric_cents(-1234),  # -12.34
+            b"\x00\x00\x00\x0c\x00\x02\x00\x00\x40\x00\x00\x02\x00\x0c\x0d\x48",
+        )
+        self.assertEqual(
+            encode_numeric_cents(1000000),  # 10000.00
+            b"\x00\x00\x00\x0a\x00\x01\x00\x01\x00\x00\x00\x02\x00\x01",
+        )
+
+
+class BinaryCopyEncoderTests(SimpleTestCase):
+    encoder = BinaryCopyEncoder([encode_text, encode_bool])
+    expected = (
+        b"PGCOPY\n\xff\r\n\x00"
+        + b"\x00\x00\x00\x00"  # flags
+        + b"\x00\x00\x00\x00"  # header extension length
+        + b"\x00\x02" + b"\x00\x00\x00\x01a" + b"\x00\x00\x00\x01\x01"
+        + b"\x00\x02" + b"\xff\xff\xff\xff" + b"\x00\x00\x00\x01\x00"  # NULL text
+        + b"\xff\xff"
+    )
+    rows = [("a", True), (None, False)]
+
+    def test_header_and_trailer_constants(self):
+        self.assertEqual(COPY_HEADER, self.expected[:19])
+        self.assertEqual(COPY_TRAILER, b"\xff\xff")
+
+    def test_stream_reads_whole_copy_data(self):
+        stream = self.encoder.stream(self.rows)
+        self.assertEqual(stream.read(), self.expected)
+        self.assertEqual(stream.read(), b"")
+
+    def test_stream_small_reads_reassemble(self):
+        stream = self.encoder.stream(self.rows)
+        chunks = []
+        while True:
+            chunk = stream.read(3)
+            if not chunk:
+                break
+            self.assertLessEqual(len(chunk), 3)
+            chunks.append(chunk)
+        self.assertEqual(b"".join(chunks), self.expected)
+
+    def test_stream_encodes_rows_lazily(self):
+        consumed = []
+
+        def rows():
+            for row in self.rows:
+                consumed.append(row)
+                yield row
+
+        stream = self.encoder.stream(rows())
+        self.assertEqual(consumed, [])
+        stream.read(len(COPY_HEADER))
+        self.assertEqual(consumed, [])
+        stream.read(1)
+        self.assertEqual(consumed, self.rows[:1])
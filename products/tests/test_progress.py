@@ -0,0 +1,44 @@
+from django.test import SimpleTestCase, TestCase
+
+from products.models import UploadJob
+from products.progress import job_progress
+
+
+class JobProgressTests(SimpleTestCase):
+    def test_counts_truncated_errors(self):
+        errors = [{"line": 2, "error": "Invalid price"}, {"line": 5, "error": "Missing sku"}]
+        payload = job_progress("in_progress", 50, 200, errors, errors_truncated=7)
+        self.assertEqual(payload["errors"], 9)
+        self.assertEqual(payload["error"], "Invalid price")
+        self.assertEqual(payload["percent"], 25)
+
+    def test_defaults_for_empty_job(self):
+        self.assertEqual(
+            job_progress("pending", None, None, None),
+            {"status": "pending", "processed": 0, "total": 0, "percent": 0, "errors": 0, "error": None},
+        )
+        self.assertEqual(job_progress("failed", 0, 0, [], None)["errors"], 0)
+
+
+class UploadProgressViewTests(TestCase):
+    def test_reports_truncated_errors(self):
+        UploadJob.objects.create(
+            task_id="abc123",
+            filename="products.csv",
+            status=UploadJob.Status.COMPLETED,
+            total_rows=10,
+            processed_rows=10,
+            errors_json=[{"line": 3, "error": "Invalid price"}],
+            errors_truncated=4,
+        )
+        response = self.client.get("/api/uploads/abc123/progress/")
+        self.assertEqual(response.status_code, 200)
+        progress = response.json()["progress"]
+        self.assertEqual(progress["errors"], 5)
+        self.assertEqual(progress["error"], "Invalid price")
+        self.assertEqual(progress["percent"], 100)
+
+    def test_unknown_task(self):
+        response = self.client.get("/api/uploads/missing/progress/")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"task_id": "missing", "progress": None})
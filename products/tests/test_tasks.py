@@ -0,0 +1,217 @@
+from collections import OrderedDict
+from functools import partial
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase
+from psycopg2 import errors
+
+from products import tasks
+from products.models import DeletionJob, Product
+from products.utils.prefetch import prefetch
+
+
+class FlushPendingRowsTests(SimpleTestCase):
+    rows = [("A-1", "Widget", "", 999, True, None, None)]
+    staging = mock.sentinel.staging
+
+    def test_direct_copy_keeps_copying_directly(self):
+        with mock.patch.object(tasks, "_copy_rows_into_products") as direct, mock.patch.object(
+            tasks, "_copy_batch_to_database"
+        ) as staged:
+            self.assertTrue(tasks._flush_pending_rows(None, self.rows, self.staging, direct_copy=True))
+        direct.assert_called_once_with(None, self.rows)
+        staged.assert_not_called()
+
+    def test_unique_violation_from_copy_falls_back_to_staging(self):
+        # copy_expert() raises psycopg2's exception, untranslated by Django.
+        with mock.patch.object(
+            tasks, "_copy_rows_into_products", side_effect=errors.UniqueViolation()
+        ), mock.patch.object(tasks, "_copy_batch_to_database") as staged:
+            self.assertFalse(tasks._flush_pending_rows(None, self.rows, self.staging, direct_copy=True))
+        staged.assert_called_once_with(None, self.rows, self.staging)
+
+
+class ParsePriceCentsTests(SimpleTestCase):
+    def test_plain_decimals(self):
+        cases = {
+            "12": 1200,
+            "12.3": 1230,
+            "12.34": 1234,
+            "-1.25": -125,
+            "0": 0,
+            "0.00": 0,
+            "": 0,
+        }
+        for raw, cents in cases.items():
+            with self.subTest(raw=raw):
+                self.assertEqual(tasks._parse_price_cents(raw), cents)
+
+    def test_signs_and_bare_decimal_points(self):
+        # Accepted by the original Decimal parse; rejected by the first cents
+        # pattern and restored since.
+        cases = {"+1": 100, "+1.50": 150, ".5": 50, "-.5": -50, "5.": 500, "-5.": -500}
+        for raw, cents in cases.items():
+            with self.subTest(raw=raw):
+                self.assertEqual(tasks._parse_price_cents(raw), cents)
+
+    def test_rejected_values(self):
+        for raw in ("1e3", "1E-2", "1.234", "  ", ".", "+", "-", "+-1", "1.2.3", "abc", "NaN", "1,50"):
+            with self.subTest(raw=raw):
+                self.assertIsNone(tasks._parse_price_cents(raw))
+
+
+class NormalizeBatchTests(SimpleTestCase):
+    now = object()
+
+    def test_rows_and_errors(self):
+        batch = [
+            (2, (" A-1 ", " Widget ", " Blue ", " 9.99 ", " TRUE ")),
+            (3, ("A-2", "Gadget", "", "   ", "no")),
+            (4, ("", "No SKU", "", "1", "yes")),
+            (5, ("A-4", "Bad price", "", "1e3", "yes")),
+        ]
+        row_count, rows, errors = tasks._normalize_batch(batch, self.now)
+        self.assertEqual(row_count, 4)
+        self.assertEqual(
+            rows,
+            [
+                ("A-1", "Widget", "Blue", 999, True, self.now, self.now),
+                ("A-2", "Gadget", "", 0, False, self.now, self.now),  # blank price is stripped to 0
+            ],
+        )
+        self.assertEqual(
+            errors,
+            [
+                {"row": 4, "error": "SKU is required."},
+                {"row": 5, "error": "Invalid price value '1e3'."},
+            ],
+        )
+
+
+@mock.patch.object(tasks, "_publish_progress", side_effect=lambda *args: args[3])
+class BulkDeleteTests(TestCase):
+    def test_batched_delete_without_ctid(self, publish):
+        # The ctid DELETE is PostgreSQL-only; other backends delete by pk batches.
+        Product.objects.bulk_create([Product(sku=f"SKU-{i}", name="Widget", price=1) for i in range(25)])
+        job = DeletionJob.objects.create(status=DeletionJob.Status.PENDING, total_count=25, deleted_count=0)
+        with self.settings(PRODUCT_IMPORT={**settings.PRODUCT_IMPORT, "delete_batch_size": 10}):
+            tasks.bulk_delete_products_task.apply(args=(job.pk,))
+        job.refresh_from_db()
+        self.assertEqual(job.status, DeletionJob.Status.COMPLETED)
+        self.assertEqual(job.deleted_count, 25)
+        self.assertFalse(Product.objects.exists())
+        self.assertEqual(publish.call_args.args[3]["status"], "completed")
+
+
+class NormalizePoolTests(SimpleTestCase):
+    @mock.patch.object(tasks, "_normalize_pool", None)
+    def test_workers_are_forked_before_the_pool_is_returned(self):
+        pool = tasks._get_normalize_pool(2)
+        self.addCleanup(pool.shutdown)
+        # Forked on the calling thread, so later submits from the prefetch
+        # thread never fork a multithreaded process.
+        self.assertEqual(len(pool._processes), 2)
+        worker_pids = set(pool._processes)
+
+        batches = [[(2, ("A-1", "Widget", "", "1.50", "yes"))], [(3, ("A-2", "Gadget", "", "2", "no"))]]
+        normalize = partial(tasks._normalize_batch, now=None)
+        results = list(prefetch(tasks._map_in_pool(pool, normalize, batches, depth=2), depth=2))
+        self.assertEqual([row_count for row_count, _, _ in results], [1, 1])
+        self.assertEqual(set(pool._processes), worker_pids)
+        self.assertIs(tasks._get_normalize_pool(2), pool)
+
+
+class PublishProgressCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.channel_layer = mock.Mock(group_send=mock.AsyncMock())
+        for patcher in (
+            mock.patch.object(tasks, "_get_channel_layer", return_value=self.channel_layer),
+            mock.patch.object(tasks, "_last_progress_frames", OrderedDict()),
+            mock.patch.object(tasks, "PROGRESS_FRAME_CACHE_SIZE", 3),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def publish(self, job_id, status="pending", processed=0):
+        tasks.publish_delete_progress(job_id, status=status, processed=processed, total=10, percent=0, errors=0)
+
+    def test_identical_frames_are_sent_once(self):
+        self.publish(1)
+        self.publish(1)
+        self.publish(1, processed=5)
+        self.assertEqual(self.channel_layer.group_send.await_count, 2)
+
+    def test_cache_is_bounded(self):
+        for job_id in range(10):
+            self.publish(job_id)
+        self.assertEqual(list(tasks._last_progress_frames), ["delete_7", "delete_8", "delete_9"])
+        # An evicted group is simply sent again.
+        self.publish(0)
+        self.assertEqual(self.channel_layer.group_send.await_count, 11)
+
+    def test_terminal_status_evicts_group(self):
+        self.publish(1)
+        self.publish(1, status="completed")
+        self.assertNotIn("delete_1", tasks._last_progress_frames)
+
+
+class SecondaryIndexesDroppedTests(SimpleTestCase):
+    definitions = ["CREATE INDEX product_name_idx ON products_product (name)"]
+
+    def setUp(self):
+        patcher = mock.patch.multiple(
+            tasks,
+            connection=mock.DEFAULT,
+            _ensure_product_indexes=mock.DEFAULT,
+            _drop_secondary_indexes=mock.DEFAULT,
+            _restore_indexes=mock.DEFAULT,
+        )
+        self.mocks = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mocks["_drop_secondary_indexes"].return_value = self.definitions
+        self.mocks["_restore_indexes"].return_value = []
+        self.cursor = self.mocks["connection"].cursor.return_value.__enter__.return_value
+
+    def lock_statements(self):
+        return [call.args[0] for call in self.cursor.execute.call_args_list]
+
+    def test_drops_and_rebuilds_under_the_lock(self):
+        self.cursor.fetchone.return_value = (True,)
+        with tasks._secondary_indexes_dropped():
+            self.mocks["_restore_indexes"].assert_not_called()
+        self.mocks["_ensure_product_indexes"].assert_called_once_with()
+        self.mocks["_restore_indexes"].assert_called_once_with(self.definitions)
+        self.assertEqual(
+            self.lock_statements(), ["SELECT pg_try_advisory_lock(%s);", "SELECT pg_advisory_unlock(%s);"]
+        )
+
+    def test_rebuilds_and_unlocks_when_the_load_fails(self):
+        self.cursor.fetchone.return_value = (True,)
+        with self.assertRaises(ValueError), tasks._secondary_indexes_dropped():
+            raise ValueError("load failed")
+        self.mocks["_restore_indexes"].assert_called_once_with(self.definitions)
+        self.assertEqual(self.lock_statements()[-1], "SELECT pg_advisory_unlock(%s);")
+
+    def test_failed_rebuild_raises_and_unlocks(self):
+        self.cursor.fetchone.return_value = (True,)
+        self.mocks["_restore_indexes"].return_value = self.definitions
+        with self.assertRaisesMessage(RuntimeError, "Failed to rebuild indexes"):
+            with tasks._secondary_indexes_dropped():
+                pass
+        self.mocks["_restore_indexes"].assert_called_once_with(self.definitions)
+        self.assertEqual(self.lock_statements()[-1], "SELECT pg_advisory_unlock(%s);")
+
+    def test_leaves_indexes_alone_when_lock_is_taken(self):
+        self.cursor.fetchone.return_value = (False,)
+        with tasks._secondary_indexes_dropped():
+            pass
+        self.mocks["_ensure_product_indexes"].assert_not_called()
+        self.mocks["_drop_secondary_indexes"].assert_not_called()
+        self.assertEqual(self.lock_statements(), ["SELECT pg_try_advisory_lock(%s);"])
+
+    def test_disabled_skips_the_lock(self):
+        with tasks._secondary_indexes_dropped(False):
+            pass
+        self.mocks["connection"].cursor.assert_not_called()
+        self.mocks["_drop_secondary_indexes"].assert_not_called()
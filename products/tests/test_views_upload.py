@@ -0,0 +1,107 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.test import SimpleTestCase
+
+from products.views_upload import UPLOAD_SNIFF_SIZE, _looks_like_csv, _store_upload
+
+UPLOAD_URL = "/api/uploads/"
+
+
+class LooksLikeCSVTests(SimpleTestCase):
+    def test_accepts_csv(self):
+        self.assertTrue(_looks_like_csv(b"sku,name,price\nA-1,Widget,9.99\n"))
+        self.assertTrue(_looks_like_csv(b"\xef\xbb\xbfsku,name\n"))  # UTF-8 BOM
+        self.assertTrue(_looks_like_csv(b"sku,name"))  # header only, no newline
+
+    def test_accepts_multibyte_character_cut_at_block_end(self):
+        head = ("sku,name\n" + "é" * UPLOAD_SNIFF_SIZE).encode()[:UPLOAD_SNIFF_SIZE]
+        self.assertTrue(_looks_like_csv(head))
+
+    def test_rejects_binary_and_non_utf8(self):
+        self.assertFalse(_looks_like_csv(b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"))
+        self.assertFalse(_looks_like_csv(b"sku,name\n\xff\xfe,x\n"))
+
+    def test_rejects_text_without_delimited_header(self):
+        self.assertFalse(_looks_like_csv(b"just some notes\nsecond line, with a comma\n"))
+        self.assertFalse(_looks_like_csv(b"a," + b"x" * UPLOAD_SNIFF_SIZE))
+
+
+class UploadSniffTests(SimpleTestCase):
+    def test_rejects_non_csv_before_writing_it(self):
+        upload = SimpleUploadedFile("photo.csv", b"\x89PNG\r\n\x1a\n\x00\x00" * 1000)
+        with mock.patch.object(TemporaryFileUploadHandler, "receive_data_chunk") as write_chunk:
+            response = self.client.post(UPLOAD_URL, {"file": upload})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "Uploaded file is not a UTF-8 encoded CSV."})
+        write_chunk.assert_not_called()
+
+
+class UploadTruncateConfirmationTests(SimpleTestCase):
+    csv_bytes = b"sku,name,price\nA-1,Widget,9.99\n"
+
+    def test_truncate_before_requires_confirm_phrase(self):
+        for data in ({}, {"confirm_phrase": "delete all products"}):
+            upload = SimpleUploadedFile("products.csv", self.csv_bytes)
+            with mock.patch("products.views_upload._store_upload") as store:
+                response = self.client.post(UPLOAD_URL, {"file": upload, "truncate_before": "true", **data})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("confirmation phrase", response.json()["detail"])
+            store.assert_not_called()
+
+
+class StoreUploadTests(SimpleTestCase):
+    data = b"sku,name,price\n" + b"A-1,Widget,9.99\n" * 5000
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.destination = Path(tmp.name) / "stored.csv"
+
+    def spooled_upload(self) -> TemporaryUploadedFile:
+        upload = TemporaryUploadedFile("products.csv", "text/csv", len(self.data), None)
+        self.addCleanup(upload.close)
+        upload.write(self.data)
+        upload.flush()
+        return upload
+
+    def test_spooled_upload_is_renamed(self):
+        upload = self.spooled_upload()
+        temp_path = upload.temporary_file_path()
+        with mock.patch("os.sendfile") as sendfile:
+            _store_upload(upload, self.destination)
+        sendfile.assert_not_called()
+        self.assertFalse(os.path.exists(temp_path))
+        self.assertEqual(self.destination.read_bytes(), self.data)
+
+    @mock.patch("sys.platform", "linux")
+    def test_cross_filesystem_upload_uses_sendfile(self):
+        with mock.patch("os.replace", side_effect=OSError("EXDEV")), mock.patch(
+            "os.sendfile", wraps=os.sendfile
+        ) as sendfile:
+            _store_upload(self.spooled_upload(), self.destination)
+        sendfile.assert_called()
+        self.assertEqual(self.destination.read_bytes(), self.data)
+
+    @mock.patch("sys.platform", "linux")
+    def test_sendfile_failure_falls_back_to_copy(self):
+        with mock.patch("os.replace", side_effect=OSError("EXDEV")), mock.patch(
+            "os.sendfile", side_effect=OSError("not supported")
+        ):
+            _store_upload(self.spooled_upload(), self.destination)
+        self.assertEqual(self.destination.read_bytes(), self.data)
+
+    @mock.patch("sys.platform", "darwin")
+    def test_sendfile_only_used_on_linux(self):
+        with mock.patch("os.replace", side_effect=OSError("EXDEV")), mock.patch("os.sendfile") as sendfile:
+            _store_upload(self.spooled_upload(), self.destination)
+        sendfile.assert_not_called()
+        self.assertEqual(self.destination.read_bytes(), self.data)
+
+    def test_in_memory_upload_is_copied(self):
+        _store_upload(SimpleUploadedFile("products.csv", self.data), self.destination)
+        self.assertEqual(self.destination.read_bytes(), self.data)
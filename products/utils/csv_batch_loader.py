@@ -1,34 +1,136 @@
 import csv
+import io
+import mmap
+import os
+import re
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 
 
-Row = Dict[str, str]
+Row = Union[Dict[str, str], Tuple[str, ...]]
 RowWithLineNumber = Tuple[int, Row]
 
+_COUNT_CHUNK_SIZE = 1 << 20
+# Read buffer for the parsing passes; far fewer read() syscalls than the 8 KiB default.
+_READ_BUFFER_SIZE = 1 << 20
+# A quoted field, as the csv module reads one: the opening quote must start
+# the field (start of file, or after a comma or line break), and "" is an
+# escaped quote. Stray quotes inside unquoted fields (27" monitor) are literal
+# text and never match.
+_QUOTED_FIELD = re.compile(rb'(?:^|(?<=[,\n]))"[^"]*(?:""[^"]*)*"')
+
+
+def _advise_sequential(file_obj, offset: int = 0, length: int = 0) -> None:
+    """Ask the kernel for aggressive readahead so disk reads overlap with parsing."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = file_obj.fileno()
+        os.posix_fadvise(fd, offset, length, os.POSIX_FADV_SEQUENTIAL)
+        os.posix_fadvise(fd, offset, length, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+
+
+def _count_bytes(buffer: mmap.mmap, needle: bytes, start: int, end: int) -> int:
+    return sum(
+        buffer[offset:min(offset + _COUNT_CHUNK_SIZE, end)].count(needle)
+        for offset in range(start, end, _COUNT_CHUNK_SIZE)
+    )
+
+
+class _BoundedReader(io.RawIOBase):
+    """Raw reader exposing at most ``limit`` bytes of an open binary file."""
+
+    def __init__(self, raw_file, limit: int) -> None:
+        self._raw_file = raw_file
+        self._remaining = limit
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._remaining <= 0:
+            return 0
+        read = self._raw_file.readinto(memoryview(buffer)[: self._remaining])
+        self._remaining -= read
+        return read
+
 
 class CSVBatchLoader:
-    """Utility to iterate over CSV rows in fixed-size batches."""
+    """Utility to iterate over CSV rows in fixed-size batches.
+
+    When ``columns`` is given (lowercase column name -> value used when the
+    header lacks that column), rows are yielded as tuples in that column order
+    instead of dicts, with header names matched case-insensitively.
+
+    ``has_quoted_newlines`` controls the quoted-newline correction in
+    ``count_rows``: True always applies it, False never does (a pure byte
+    count), and None applies it when the file contains any quote character.
 
-    def __init__(self, file_path: Path, batch_size: int = 5000, encoding: str = "utf-8") -> None:
+    ``byte_range`` (from ``split``) restricts tuple iteration to one slice of
+    the data rows; the header is still read from the top of the file.
+    """
+
+    def __init__(
+        self,
+        file_path: Path,
+        batch_size: int = 5000,
+        encoding: str = "utf-8",
+        columns: Optional[Mapping[str, str]] = None,
+        has_quoted_newlines: Optional[bool] = None,
+        byte_range: Optional[Tuple[int, int]] = None,
+        first_line_number: int = 2,
+    ) -> None:
         self.file_path = Path(file_path)
         self.batch_size = batch_size
         self.encoding = encoding
+        self.columns = columns
+        self.has_quoted_newlines = has_quoted_newlines
+        self.byte_range = byte_range
+        self.first_line_number = first_line_number
+        self._row_count: Optional[int] = None
 
     def count_rows(self) -> int:
-        """Count data rows (excluding header)."""
-        total = 0
-        with self.file_path.open(newline="", encoding=self.encoding) as csvfile:
-            reader = csv.reader(csvfile)
-            for index, _ in enumerate(reader):
-                if index == 0:
-                    continue  # skip header
-                total += 1
-        return total
+        """Count data rows (excluding header) from the file's line breaks.
+
+        The file is memory-mapped and scanned in C, which leaves it in the page
+        cache for the parsing pass. Line breaks inside quoted fields are
+        subtracted according to ``has_quoted_newlines``. Blank lines are still
+        counted, so the result can overestimate but never undercounts, which
+        keeps it safe for progress reporting and size thresholds. The result
+        is cached per loader.
+        """
+        if self._row_count is not None:
+            return self._row_count
+
+        with self.file_path.open("rb") as raw_file:
+            if os.fstat(raw_file.fileno()).st_size == 0:
+                self._row_count = 0
+                return 0
+            with mmap.mmap(raw_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                lines = _count_bytes(buffer, b"\n", 0, len(buffer))
+                if buffer[-1:] != b"\n":
+                    lines += 1  # last line has no trailing newline
+                correct_quotes = self.has_quoted_newlines
+                if correct_quotes is None:
+                    correct_quotes = buffer.find(b'"') != -1
+                if correct_quotes:
+                    lines -= sum(match.group().count(b"\n") for match in _QUOTED_FIELD.finditer(buffer))
+
+        self._row_count = max(lines - 1, 0)  # skip header
+        return self._row_count
 
     def iter_batches(self) -> Iterator[List[RowWithLineNumber]]:
         """Yield batches of rows with their original line numbers."""
-        with self.file_path.open(newline="", encoding=self.encoding) as csvfile:
+        if self.columns is not None:
+            yield from self._iter_tuple_batches()
+            return
+
+        with self.file_path.open(newline="", encoding=self.encoding, buffering=_READ_BUFFER_SIZE) as csvfile:
+            _advise_sequential(csvfile)
             reader = csv.DictReader(csvfile)
             if reader.fieldnames is None:
                 raise ValueError("CSV file must include a header row.")
@@ -46,6 +148,123 @@ class CSVBatchLoader:
             if batch:
                 yield batch
 
+    def _iter_tuple_batches(self) -> Iterator[List[RowWithLineNumber]]:
+        with self.file_path.open(newline="", encoding=self.encoding, buffering=_READ_BUFFER_SIZE) as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader, None)
+            if header is None:
+                raise ValueError("CSV file must include a header row.")
+            if self.byte_range is None:
+                _advise_sequential(csvfile)
+                yield from self._pick_batches(reader, header, 2)
+                return
+
+        start, end = self.byte_range
+        with self.file_path.open("rb", buffering=0) as raw_file:
+            raw_file.seek(start)
+            _advise_sequential(raw_file, start, end - start)
+            stream = io.TextIOWrapper(
+                io.BufferedReader(_BoundedReader(raw_file, end - start), buffer_size=_READ_BUFFER_SIZE),
+                encoding=self.encoding,
+                newline="",
+            )
+            yield from self._pick_batches(csv.reader(stream), header, self.first_line_number)
+
+    def _pick_batches(
+        self, reader: Iterator[List[str]], header: Sequence[str], line_number: int
+    ) -> Iterator[List[RowWithLineNumber]]:
+        pick, width, blank, tail = self._column_plan(header, self.columns)
+
+        def fit(row: List[str]) -> List[str]:
+            # Pad/trim to the header width, then append defaults for the
+            # requested columns the header doesn't have.
+            if len(row) < width:
+                row.extend(blank[len(row):])
+            row[width:] = tail
+            return row
+
+        rows = filter(None, reader)  # DictReader skips blank lines too
+        while True:
+            raw_batch = list(islice(rows, self.batch_size))
+            if not raw_batch:
+                break
+            picked = None
+            if not tail:
+                # Well-formed batches are picked entirely in C; a short
+                # row raises IndexError and the batch takes the slow path.
+                try:
+                    picked = list(map(pick, raw_batch))
+                except IndexError:
+                    picked = None
+            if picked is None:
+                picked = [pick(fit(row)) for row in raw_batch]
+            yield list(zip(range(line_number, line_number + len(raw_batch)), picked))
+            line_number += len(raw_batch)
+
+    def split(self, parts: int) -> List[Tuple[int, int, int]]:
+        """Split the data rows into up to ``parts`` byte ranges on record boundaries.
+
+        Returns ``(start, end, first_line_number)`` tuples suitable for the
+        ``byte_range``/``first_line_number`` arguments of new loaders. A split
+        point is only taken after a newline outside every quoted field, so
+        quoted fields are never cut in half. Line numbers count
+        physical lines, so they can drift from the sequential loader's after
+        blank lines or quoted newlines.
+        """
+        with self.file_path.open("rb") as raw_file:
+            size = os.fstat(raw_file.fileno()).st_size
+            if size == 0:
+                return []
+            with mmap.mmap(raw_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                position = self._record_end(buffer, 0, 0)  # end of the header
+                if position >= size:
+                    return []
+                ranges = []
+                line_number = 2
+                step = max(1, (size - position) // max(1, parts))
+                while position < size:
+                    end = size if len(ranges) == parts - 1 else self._record_end(buffer, position, position + step)
+                    ranges.append((position, end, line_number))
+                    line_number += _count_bytes(buffer, b"\n", position, end)
+                    position = end
+                return ranges
+
+    @staticmethod
+    def _record_end(buffer: mmap.mmap, start: int, target: int) -> int:
+        """Offset just past the first record-ending newline at or after ``target``.
+
+        ``start`` must be a record boundary; quoted fields are tracked from there.
+        """
+        size = len(buffer)
+        position = min(target, size)
+        for match in _QUOTED_FIELD.finditer(buffer, start):
+            if match.end() <= position:
+                continue
+            if match.start() < position:
+                position = match.end()  # target fell inside this field
+                continue
+            newline = buffer.find(b"\n", position, match.start())
+            if newline != -1:
+                return newline + 1
+            position = match.end()
+        newline = buffer.find(b"\n", position)
+        return size if newline == -1 else newline + 1
+
+    @staticmethod
+    def _column_plan(header: Sequence[str], columns: Mapping[str, str]):
+        index = {name.lower(): position for position, name in enumerate(header) if name}
+        width = len(header)
+        positions = []
+        tail: List[str] = []
+        for name, default in columns.items():
+            if name in index:
+                positions.append(index[name])
+            else:
+                positions.append(width + len(tail))
+                tail.append(default)
+        getter = itemgetter(*positions)
+        pick = getter if len(positions) > 1 else (lambda row: (getter(row),))
+        return pick, width, [""] * width, tail
+
     def __iter__(self) -> Iterable[List[RowWithLineNumber]]:
         return self.iter_batches()
-
@@ -1,12 +1,13 @@
-from typing import Optional
-
 from django.conf import settings
 from rest_framework import permissions, status
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from .models import DeletionJob, Product
-from .tasks import bulk_delete_products_task, publish_delete_progress
+from .progress import job_progress
+from .renderers import ORJSONRenderer
+from .tasks import bulk_delete_products_task, estimate_product_count, publish_delete_progress
 
 
 class ProductBulkDeleteView(APIView):
@@ -26,8 +27,12 @@ class ProductBulkDeleteView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        total = Product.objects.count()
         threshold = getattr(settings, "PRODUCT_BULK_DELETE_THRESHOLD", 10000)
+        total = estimate_product_count()
+        if total < threshold:
+            # Statistics can lag behind recent imports; only trust them to
+            # skip the exact count when they already point at a large table.
+            total = Product.objects.count()
 
         if total == 0:
             return Response({"status": "completed", "deleted": 0})
@@ -70,33 +75,18 @@ class ProductBulkDeleteView(APIView):
 
 class DeletionProgressView(APIView):
     permission_classes = [permissions.AllowAny]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
 
     def get(self, request, job_id: int, *args, **kwargs):
-        job = DeletionJob.objects.filter(pk=job_id).first()
+        job = (
+            DeletionJob.objects.filter(pk=job_id)
+            .order_by()
+            .values("status", "deleted_count", "total_count", "errors_json")
+            .first()
+        )
         if not job:
             return Response({"job_id": job_id, "progress": None}, status=status.HTTP_404_NOT_FOUND)
 
-        total = job.total_count or 0
-        processed = job.deleted_count or 0
-        if total <= 0:
-            percent = 100 if processed > 0 else 0
-        else:
-            percent = min(100, int((processed / total) * 100))
-
-        errors = job.errors_json or []
-        error_message: Optional[str] = None
-        if errors:
-            first_error = errors[0]
-            if isinstance(first_error, dict):
-                error_message = first_error.get("error") or first_error.get("message")
-
-        payload = {
-            "status": job.status,
-            "processed": processed,
-            "total": total,
-            "percent": percent,
-            "errors": len(errors),
-            "error": error_message,
-        }
+        payload = job_progress(job["status"], job["deleted_count"], job["total_count"], job["errors_json"])
         return Response({"job_id": job_id, "progress": payload})
 
@@ -1,21 +1,132 @@
+import os
+import shutil
+import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
 from django.views.generic import TemplateView
 from rest_framework import permissions, status
 from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from .models import UploadJob
-from .tasks import import_csv_task
-
-
-def _calculate_percent(processed: int, total: int) -> int:
-    if total <= 0:
-        return 100 if processed > 0 else 0
-    return min(100, int((processed / total) * 100))
+from .progress import job_progress
+from .renderers import ORJSONRenderer
+from .tasks import TRUTHY_VALUES, import_csv_task
+
+
+# Leading bytes inspected to reject non-CSV uploads before they reach disk.
+UPLOAD_SNIFF_SIZE = 4096
+
+# Buffer for copying uploads that can't simply be renamed into place.
+UPLOAD_COPY_BUFFER_SIZE = 4 << 20
+
+
+def _looks_like_csv(head: bytes) -> bool:
+    """Cheap check that an upload starts like a UTF-8 CSV: text with a delimited header line."""
+    if b"\x00" in head:
+        return False
+    try:
+        text = head.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        # The sniffed block may end part-way through a multi-byte character.
+        if exc.reason != "unexpected end of data":
+            return False
+        text = head[: exc.start].decode("utf-8")
+    header, newline, _ = text.partition("\n")
+    if not newline and len(head) >= UPLOAD_SNIFF_SIZE:
+        return False  # no line break in the whole sniffed block
+    return "," in header
+
+
+class _CSVSniffingUploadHandler(TemporaryFileUploadHandler):
+    """Spools uploads to a temp file, skipping any whose first chunk isn't CSV.
+
+    The check runs before the first chunk is written, so the multipart parser
+    reads and discards the rest of a rejected file instead of spooling it.
+    """
+
+    rejected = False
+
+    def receive_data_chunk(self, raw_data, start):
+        if start == 0 and not _looks_like_csv(raw_data[:UPLOAD_SNIFF_SIZE]):
+            self.rejected = True
+            raise SkipFile()
+        return super().receive_data_chunk(raw_data, start)
+
+
+@lru_cache(maxsize=1)
+def _uploads_dir() -> Path:
+    """Resolve (and create, once per process) the directory uploads are stored in."""
+    media_root = Path(getattr(settings, "MEDIA_ROOT", settings.BASE_DIR / "media"))
+    uploads_dir = media_root / "uploads"
+    uploads_dir.mkdir(parents=True, exist_ok=True)
+    return uploads_dir
+
+
+def _preallocate(fd: int, size: Optional[int]) -> None:
+    """Reserve the destination's extents up front instead of growing it per write."""
+    if not size or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError:
+        pass  # e.g. filesystems without fallocate support
+
+
+def _sendfile_copy(source_path: str, final_path: Path, size: Optional[int]) -> None:
+    src_fd = os.open(source_path, os.O_RDONLY)
+    try:
+        dst_fd = os.open(final_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            _preallocate(dst_fd, size)
+            offset = 0
+            while True:
+                sent = os.sendfile(dst_fd, src_fd, offset, UPLOAD_COPY_BUFFER_SIZE)
+                if not sent:
+                    break
+                offset += sent
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def _store_upload(uploaded_file, final_path: Path) -> None:
+    """Move or copy an uploaded file to ``final_path``.
+
+    Uploads spooled to disk are renamed into place when the temp directory is
+    on the same filesystem, otherwise copied in the kernel with sendfile()
+    on Linux (elsewhere it only writes to sockets); everything else goes
+    through a 4 MiB copy buffer.
+    """
+    if isinstance(uploaded_file, TemporaryUploadedFile):
+        try:
+            os.replace(uploaded_file.temporary_file_path(), final_path)
+        except OSError:
+            pass  # e.g. FILE_UPLOAD_TEMP_DIR on another filesystem
+        else:
+            if settings.FILE_UPLOAD_PERMISSIONS is not None:
+                os.chmod(final_path, settings.FILE_UPLOAD_PERMISSIONS)
+            return
+
+    if isinstance(uploaded_file, TemporaryUploadedFile) and sys.platform.startswith("linux"):
+        try:
+            _sendfile_copy(uploaded_file.temporary_file_path(), final_path, uploaded_file.size)
+            return
+        except OSError:
+            pass  # e.g. a filesystem without sendfile support; copy below instead
+
+    uploaded_file.seek(0)
+    with final_path.open("wb", buffering=UPLOAD_COPY_BUFFER_SIZE) as destination:
+        _preallocate(destination.fileno(), uploaded_file.size)
+        shutil.copyfileobj(uploaded_file, destination, UPLOAD_COPY_BUFFER_SIZE)
 
 
 class UploadPageView(TemplateView):
@@ -46,8 +157,20 @@ class UploadCSVView(APIView):
 
     max_upload_size = 200 * 1024 * 1024  # 200 MB
 
+    def initialize_request(self, request, *args, **kwargs):
+        # Always spool the upload to a temp file, even small ones, so it can
+        # be renamed into media/uploads rather than copied there.
+        self.upload_handler = _CSVSniffingUploadHandler(request)
+        request.upload_handlers = [self.upload_handler]
+        return super().initialize_request(request, *args, **kwargs)
+
     def post(self, request, *args, **kwargs):
         uploaded_file = request.FILES.get("file")
+        if not uploaded_file and self.upload_handler.rejected:
+            return Response(
+                {"detail": "Uploaded file is not a UTF-8 encoded CSV."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         if not uploaded_file:
             return Response(
                 {"detail": "No file uploaded under 'file' field."},
@@ -74,22 +197,28 @@ class UploadCSVView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        media_root = Path(getattr(settings, "MEDIA_ROOT", settings.BASE_DIR / "media"))
-        uploads_dir = media_root / "uploads"
-        uploads_dir.mkdir(parents=True, exist_ok=True)
+        # Replacing the catalogue deletes every product, so it needs the same
+        # confirmation phrase as ProductBulkDeleteView.
+        truncate_before = str(request.data.get("truncate_before", "")).lower() in TRUTHY_VALUES
+        expected_phrase = getattr(settings, "PRODUCT_DELETE_CONFIRM_PHRASE", "")
+        confirm_phrase = request.data.get("confirm_phrase") or ""
+        if truncate_before and expected_phrase and confirm_phrase.strip() != expected_phrase:
+            return Response(
+                {"detail": f"Invalid confirmation phrase. Expected '{expected_phrase}'."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         upload_job_id = UploadJob.generate_task_id()
         stored_filename = f"{upload_job_id}.csv"
-        final_path = uploads_dir / stored_filename
+        final_path = _uploads_dir() / stored_filename
 
-        with final_path.open("wb+") as destination:
-            for chunk in uploaded_file.chunks():
-                destination.write(chunk)
+        _store_upload(uploaded_file, final_path)
 
         job = UploadJob.objects.create(
             task_id=upload_job_id,
             filename=original_name,
             status=UploadJob.Status.PENDING,
+            truncate_before=truncate_before,
         )
 
         user_id = request.user.id if request.user and request.user.is_authenticated else None
@@ -100,29 +229,25 @@ class UploadCSVView(APIView):
 
 class UploadProgressView(APIView):
     permission_classes = [permissions.AllowAny]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
 
     def get(self, request, task_id: str, *args, **kwargs):
-        job = UploadJob.objects.filter(task_id=task_id).first()
+        # Polled repeatedly during an import: fetch just the progress columns
+        # as a dict, without the model's -created_at ordering.
+        job = (
+            UploadJob.objects.filter(task_id=task_id)
+            .order_by()
+            .values("status", "processed_rows", "total_rows", "errors_json", "errors_truncated")
+            .first()
+        )
         if not job:
             return Response({"task_id": task_id, "progress": None}, status=status.HTTP_404_NOT_FOUND)
 
-        total = job.total_rows or 0
-        processed = job.processed_rows or 0
-        percent = _calculate_percent(processed, total)
-
-        errors = job.errors_json or []
-        error_message: Optional[str] = None
-        if errors:
-            first_error = errors[0]
-            if isinstance(first_error, dict):
-                error_message = first_error.get("error") or first_error.get("message")
-
-        payload = {
-            "status": job.status,
-            "processed": processed,
-            "total": total,
-            "percent": percent,
-            "errors": len(errors),
-            "error": error_message,
-        }
+        payload = job_progress(
+            job["status"],
+            job["processed_rows"],
+            job["total_rows"],
+            job["errors_json"],
+            job["errors_truncated"],
+        )
         return Response({"task_id": task_id, "progress": payload})
\ No newline at end of file
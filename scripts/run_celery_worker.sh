@@ -9,5 +9,7 @@ if [ -d "${PROJECT_ROOT}/.venv" ]; then
   source "${PROJECT_ROOT}/.venv/bin/activate"
 fi
 
-exec celery -A config worker --loglevel=info
+# Also consume webhooks_io so deliveries still go out when no dedicated
+# webhook worker (scripts/run_webhook_worker.sh) is running.
+exec celery -A config worker --loglevel=info --queues=celery,webhooks_io
 
@@ -0,0 +1,18 @@
+#!/usr/bin/env bash
+
+set -euo pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+
+if [ -d "${PROJECT_ROOT}/.venv" ]; then
+  # shellcheck source=/dev/null
+  source "${PROJECT_ROOT}/.venv/bin/activate"
+fi
+
+# Webhook deliveries only wait on outbound HTTP, so one green-threaded
+# process can keep many of them in flight.
+exec celery -A config worker --loglevel=info \
+  --pool=gevent \
+  --concurrency="${CELERY_WEBHOOK_CONCURRENCY:-64}" \
+  --queues=webhooks_io \
+  --hostname="webhooks@%h"
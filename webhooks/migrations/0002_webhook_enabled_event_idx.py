@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("webhooks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="webhook",
+            index=models.Index(fields=["enabled", "event_type"], name="wh_enabled_event_idx"),
+        ),
+    ]
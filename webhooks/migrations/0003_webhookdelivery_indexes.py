@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("webhooks", "0002_webhook_enabled_event_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="webhookdelivery",
+            index=models.Index(
+                condition=models.Q(("status", "retry")),
+                fields=["next_retry_at"],
+                name="whd_status_retry_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="webhookdelivery",
+            index=models.Index(fields=["webhook", "status"], name="whd_wh_status_idx"),
+        ),
+    ]
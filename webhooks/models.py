@@ -30,6 +30,9 @@ class Webhook(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
+        indexes = [
+            models.Index(fields=["enabled", "event_type"], name="wh_enabled_event_idx"),
+        ]
         ordering = ["-created_at"]
 
     def __str__(self) -> str:
@@ -63,6 +66,15 @@ class WebhookDelivery(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
+        indexes = [
+            # Deliveries waiting for a retry are a small slice of the table.
+            models.Index(
+                fields=["next_retry_at"],
+                name="whd_status_retry_idx",
+                condition=models.Q(status="retry"),
+            ),
+            models.Index(fields=["webhook", "status"], name="whd_wh_status_idx"),
+        ]
         ordering = ["-created_at"]
 
     def __str__(self) -> str:
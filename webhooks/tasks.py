@@ -1,15 +1,39 @@
 import time
 from datetime import timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
+import orjson
 import requests
-from celery import shared_task
+from celery import group, shared_task
 from django.utils import timezone
+from requests.adapters import HTTPAdapter
 
 from .models import Webhook, WebhookDelivery
 
 DEFAULT_TIMEOUT_SECONDS = 10
 MAX_BACKOFF_SECONDS = 60
+_DEFAULT_MAX_ATTEMPTS = WebhookDelivery._meta.get_field("max_attempts").default
+# High-frequency events that are posted without a WebhookDelivery row or
+# retries; a lost one is superseded by the next.
+EPHEMERAL_EVENT_TYPES = frozenset({Webhook.EVENT_IMPORT_PROGRESS})
+# Keep-alive connections per host kept by each worker process's HTTP session.
+HTTP_POOL_CONNECTIONS = 32
+HTTP_POOL_MAXSIZE = 128
+
+_http_session: Optional[requests.Session] = None
+
+
+def _get_http_session() -> requests.Session:
+    """Per-process session so deliveries to the same host reuse TCP/TLS connections."""
+    global _http_session
+    if _http_session is None:
+        session = requests.Session()
+        # Retries are handled by the task itself.
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _http_session = session
+    return _http_session
 
 
 def _create_delivery(
@@ -25,7 +49,7 @@ def _create_delivery(
         event_type=event_type,
         payload=payload,
         is_test=is_test,
-        max_attempts=max_attempts or WebhookDelivery._meta.get_field("max_attempts").default,
+        max_attempts=max_attempts or _DEFAULT_MAX_ATTEMPTS,
     )
     return delivery
 
@@ -35,13 +59,21 @@ def _queue_delivery(delivery: WebhookDelivery) -> None:
 
 
 def queue_event(event_type: str, payload: Dict[str, Any]) -> int:
-    webhooks = Webhook.objects.filter(enabled=True, event_type=event_type)
-    count = 0
-    for webhook in webhooks:
-        delivery = _create_delivery(webhook, event_type, payload, is_test=False)
-        _queue_delivery(delivery)
-        count += 1
-    return count
+    # Only the ids are needed to point the deliveries at their webhooks.
+    webhook_ids = Webhook.objects.filter(enabled=True, event_type=event_type).values_list("id", flat=True)
+    if event_type in EPHEMERAL_EVENT_TYPES:
+        webhook_ids = list(webhook_ids)
+        if webhook_ids:
+            group(send_ephemeral_webhook.s(webhook_id, payload) for webhook_id in webhook_ids).apply_async()
+        return len(webhook_ids)
+    # One INSERT for every subscriber, then one group publish over a single
+    # broker connection instead of a delay() round trip per delivery.
+    deliveries = WebhookDelivery.objects.bulk_create(
+        [WebhookDelivery(webhook_id=webhook_id, event_type=event_type, payload=payload) for webhook_id in webhook_ids]
+    )
+    if deliveries:
+        group(send_webhook.s(delivery.id) for delivery in deliveries).apply_async()
+    return len(deliveries)
 
 
 def queue_webhook(webhook: Webhook, event_type: str, payload: Dict[str, Any], *, is_test: bool = False) -> WebhookDelivery:
@@ -50,34 +82,16 @@ def queue_webhook(webhook: Webhook, event_type: str, payload: Dict[str, Any], *,
     return delivery
 
 
-@shared_task(bind=True, name="webhooks.send_webhook", max_retries=5)
-def send_webhook(self, delivery_id: int) -> None:
-    try:
-        delivery = WebhookDelivery.objects.select_related("webhook").get(pk=delivery_id)
-    except WebhookDelivery.DoesNotExist:
-        return
-
-    webhook = delivery.webhook
-    if not webhook.enabled:
-        delivery.status = WebhookDelivery.Status.FAILED
-        delivery.error_message = "Webhook disabled"
-        delivery.save(update_fields=["status", "error_message", "updated_at"])
-        return
-
-    attempt = delivery.attempt + 1
-    delivery.attempt = attempt
-    delivery.status = WebhookDelivery.Status.IN_PROGRESS
-    delivery.error_message = ""
-    delivery.save(update_fields=["attempt", "status", "error_message", "updated_at"])
-
+def _post_json(url: str, payload: Dict[str, Any]) -> Tuple[Optional[int], int, str]:
+    """POST ``payload``; returns (status code, duration in ms, error message or "")."""
     start = time.perf_counter()
     error_message = ""
     response_code: Optional[int] = None
-
     try:
-        response = requests.post(
-            webhook.url,
-            json=delivery.payload,
+        response = _get_http_session().post(
+            url,
+            # orjson emits the UTF-8 body bytes directly.
+            data=orjson.dumps(payload),
             timeout=DEFAULT_TIMEOUT_SECONDS,
             headers={"Content-Type": "application/json"},
         )
@@ -87,63 +101,70 @@ def send_webhook(self, delivery_id: int) -> None:
             raise requests.HTTPError(error_message, response=response)
     except Exception as exc:
         error_message = str(exc) or error_message or "Webhook request failed"
-        duration_ms = int((time.perf_counter() - start) * 1000)
-        delivery.status = (
-            WebhookDelivery.Status.RETRY
-            if attempt < delivery.max_attempts
-            else WebhookDelivery.Status.FAILED
-        )
-        delivery.response_code = response_code
-        delivery.response_time_ms = duration_ms
-        delivery.error_message = error_message
-        delivery.next_retry_at = (
-            timezone.now()
-            + timedelta(seconds=min(MAX_BACKOFF_SECONDS, 2 ** attempt))
-            if delivery.status == WebhookDelivery.Status.RETRY
-            else None
-        )
-        delivery.save(
-            update_fields=[
-                "status",
-                "response_code",
-                "response_time_ms",
-                "error_message",
-                "next_retry_at",
-                "updated_at",
-            ]
-        )
+    return response_code, int((time.perf_counter() - start) * 1000), error_message
+
+
+def _record_webhook_result(
+    webhook_id: int, response_code: Optional[int], duration_ms: int, error_message: str, now
+) -> None:
+    Webhook.objects.filter(pk=webhook_id).update(
+        last_status_code=response_code,
+        last_response_time_ms=duration_ms,
+        last_error=error_message,
+        updated_at=now,
+    )
+
 
-        webhook.last_status_code = response_code
-        webhook.last_response_time_ms = duration_ms
-        webhook.last_error = error_message
-        webhook.save(update_fields=["last_status_code", "last_response_time_ms", "last_error", "updated_at"])
+@shared_task(bind=True, name="webhooks.send_webhook", max_retries=5)
+def send_webhook(self, delivery_id: int) -> None:
+    try:
+        delivery = WebhookDelivery.objects.select_related("webhook").get(pk=delivery_id)
+    except WebhookDelivery.DoesNotExist:
+        return
 
-        if delivery.status == WebhookDelivery.Status.RETRY:
-            countdown = min(MAX_BACKOFF_SECONDS, 2 ** attempt)
-            raise self.retry(countdown=countdown)
+    webhook = delivery.webhook
+    if not webhook.enabled:
+        delivery.status = WebhookDelivery.Status.FAILED
+        delivery.error_message = "Webhook disabled"
+        delivery.save(update_fields=["status", "error_message", "updated_at"])
         return
 
-    duration_ms = int((time.perf_counter() - start) * 1000)
-    delivery.status = WebhookDelivery.Status.SUCCESS
-    delivery.response_code = response_code
-    delivery.response_time_ms = duration_ms
-    delivery.error_message = ""
-    delivery.next_retry_at = None
-    delivery.save(
-        update_fields=[
-            "status",
-            "response_code",
-            "response_time_ms",
-            "error_message",
-            "next_retry_at",
-            "updated_at",
-        ]
+    # The attempt's outcome is written in one UPDATE per table once the
+    # request finishes; nothing watches the in-progress state in between.
+    attempt = delivery.attempt + 1
+    response_code, duration_ms, error_message = _post_json(webhook.url, delivery.payload)
+    if not error_message:
+        status = WebhookDelivery.Status.SUCCESS
+    elif attempt < delivery.max_attempts:
+        status = WebhookDelivery.Status.RETRY
+    else:
+        status = WebhookDelivery.Status.FAILED
+
+    now = timezone.now()
+    countdown = min(MAX_BACKOFF_SECONDS, 2 ** attempt)
+    WebhookDelivery.objects.filter(pk=delivery.pk).update(
+        attempt=attempt,
+        status=status,
+        response_code=response_code,
+        response_time_ms=duration_ms,
+        error_message=error_message,
+        next_retry_at=now + timedelta(seconds=countdown) if status == WebhookDelivery.Status.RETRY else None,
+        updated_at=now,
     )
+    _record_webhook_result(webhook.pk, response_code, duration_ms, error_message, now)
+
+    if status == WebhookDelivery.Status.RETRY:
+        raise self.retry(countdown=countdown)
 
-    webhook.last_status_code = response_code
-    webhook.last_response_time_ms = duration_ms
-    webhook.last_error = ""
-    webhook.save(update_fields=["last_status_code", "last_response_time_ms", "last_error", "updated_at"])
+
+@shared_task(name="webhooks.send_ephemeral_webhook")
+def send_ephemeral_webhook(webhook_id: int, payload: Dict[str, Any]) -> None:
+    """Post an EPHEMERAL_EVENT_TYPES event once, carrying the payload in the task itself."""
+    url = Webhook.objects.filter(pk=webhook_id, enabled=True).values_list("url", flat=True).first()
+    if url is None:
+        return
+    response_code, duration_ms, error_message = _post_json(url, payload)
+    _record_webhook_result(webhook_id, response_code, duration_ms, error_message, timezone.now())
 
 
 @shared_task(bind=True, name="webhooks.test_webhook")
@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from webhooks import tasks
+from webhooks.models import Webhook, WebhookDelivery
+
+
+class QueueEventTests(TestCase):
+    payload = {"job_id": 1, "processed": 10, "total": 100}
+
+    def setUp(self):
+        for event_type in (Webhook.EVENT_IMPORT_PROGRESS, Webhook.EVENT_IMPORT_COMPLETED):
+            for enabled in (True, True, False):
+                Webhook.objects.create(
+                    name=event_type, url="https://example.com/hook", event_type=event_type, enabled=enabled
+                )
+        self.signatures = []
+        patcher = mock.patch("webhooks.tasks.group", side_effect=self.record_group)
+        self.group = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def record_group(self, signatures):
+        self.signatures.extend(signatures)
+        return self.group.return_value
+
+    def test_ephemeral_event_skips_delivery_rows(self):
+        self.assertEqual(tasks.queue_event(Webhook.EVENT_IMPORT_PROGRESS, self.payload), 2)
+        self.assertFalse(WebhookDelivery.objects.exists())
+        signatures = self.signatures
+        self.assertEqual({signature.task for signature in signatures}, {tasks.send_ephemeral_webhook.name})
+        enabled_ids = set(
+            Webhook.objects.filter(event_type=Webhook.EVENT_IMPORT_PROGRESS, enabled=True).values_list("id", flat=True)
+        )
+        self.assertEqual({signature.args[0] for signature in signatures}, enabled_ids)
+        self.assertTrue(all(signature.args[1] == self.payload for signature in signatures))
+        self.group.return_value.apply_async.assert_called_once_with()
+
+    def test_other_events_record_deliveries(self):
+        self.assertEqual(tasks.queue_event(Webhook.EVENT_IMPORT_COMPLETED, self.payload), 2)
+        deliveries = WebhookDelivery.objects.filter(event_type=Webhook.EVENT_IMPORT_COMPLETED)
+        self.assertEqual(deliveries.count(), 2)
+        self.assertTrue(all(delivery.webhook.enabled and delivery.payload == self.payload for delivery in deliveries))
+        signatures = self.signatures
+        self.assertEqual({signature.task for signature in signatures}, {tasks.send_webhook.name})
+        self.assertEqual({signature.args[0] for signature in signatures}, set(deliveries.values_list("id", flat=True)))
+        self.group.return_value.apply_async.assert_called_once_with()
+
+    def test_no_subscribers_publishes_nothing(self):
+        Webhook.objects.update(enabled=False)
+        for event_type in (Webhook.EVENT_IMPORT_PROGRESS, Webhook.EVENT_IMPORT_COMPLETED):
+            self.assertEqual(tasks.queue_event(event_type, self.payload), 0)
+        self.group.assert_not_called()
+        self.assertFalse(WebhookDelivery.objects.exists())
@@ -0,0 +1,37 @@
+import orjson
+from django.test import TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+
+from webhooks.models import Webhook
+from webhooks.serializers import WebhookSerializer
+
+WEBHOOKS_URL = "/api/webhooks/"
+
+
+class WebhookListTests(TestCase):
+    def setUp(self):
+        Webhook.objects.create(
+            name="Progress", url="https://example.com/progress", event_type=Webhook.EVENT_IMPORT_PROGRESS
+        )
+        Webhook.objects.create(
+            name="Done",
+            url="https://example.com/done",
+            event_type=Webhook.EVENT_IMPORT_COMPLETED,
+            enabled=False,
+            last_status_code=500,
+            last_response_time_ms=120,
+            last_error="Server error",
+        )
+
+    def serialized(self):
+        webhooks = Webhook.objects.all().order_by("-created_at")
+        return orjson.loads(JSONRenderer().render(WebhookSerializer(webhooks, many=True).data))
+
+    def test_list_matches_serializer(self):
+        response = self.client.get(WEBHOOKS_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), self.serialized())
+
+    @override_settings(TIME_ZONE="America/New_York")
+    def test_list_matches_serializer_outside_utc(self):
+        self.assertEqual(self.client.get(WEBHOOKS_URL).json(), self.serialized())
@@ -12,6 +12,13 @@ class WebhookViewSet(viewsets.ModelViewSet):
     serializer_class = WebhookSerializer
     permission_classes = [permissions.AllowAny]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "list":
+            # Load only the columns the serializer renders.
+            queryset = queryset.only(*WebhookSerializer.Meta.fields)
+        return queryset
+
     @action(detail=True, methods=["post"])
     def test(self, request, pk=None):
         webhook = self.get_object()